@@ -0,0 +1,27 @@
+"""review queue indexes
+
+Revision ID: a41f8c25d9b1
+Revises: ccd87822e0e3
+Create Date: 2026-09-01 10:12:44.103522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f8c25d9b1'
+down_revision: Union[str, None] = 'ccd87822e0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_kyc_status_created', 'kyc_applications', ['status', 'created_at'], unique=False)
+    op.create_index('ix_kyc_agent_status', 'kyc_applications', ['assigned_agent_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kyc_agent_status', table_name='kyc_applications')
+    op.drop_index('ix_kyc_status_created', table_name='kyc_applications')
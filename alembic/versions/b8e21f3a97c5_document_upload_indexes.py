@@ -0,0 +1,41 @@
+"""document upload indexes
+
+Revision ID: b8e21f3a97c5
+Revises: f52a6e80c1d4
+Create Date: 2026-09-01 14:08:41.102873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e21f3a97c5'
+down_revision: Union[str, None] = 'f52a6e80c1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every upload runs the replace-existing lookup and the
+    # duplicate-hash check; both were sequential scans
+    op.create_index(
+        'ix_documents_app_type', 'documents',
+        ['kyc_application_id', 'document_type'], unique=False
+    )
+    op.create_index('ix_documents_file_hash', 'documents', ['file_hash'], unique=False)
+    # Room for the "b3:" algorithm prefix on BLAKE3 digests
+    op.alter_column('documents', 'file_hash',
+                    existing_type=sa.String(length=64),
+                    type_=sa.String(length=80),
+                    existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('documents', 'file_hash',
+                    existing_type=sa.String(length=80),
+                    type_=sa.String(length=64),
+                    existing_nullable=False)
+    op.drop_index('ix_documents_file_hash', table_name='documents')
+    op.drop_index('ix_documents_app_type', table_name='documents')
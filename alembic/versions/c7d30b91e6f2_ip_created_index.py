@@ -0,0 +1,25 @@
+"""ip/created index for count_by_ip
+
+Revision ID: c7d30b91e6f2
+Revises: a41f8c25d9b1
+Create Date: 2026-09-01 10:41:19.770286
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d30b91e6f2'
+down_revision: Union[str, None] = 'a41f8c25d9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_kyc_ip_created', 'kyc_applications', ['ip_address', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kyc_ip_created', table_name='kyc_applications')
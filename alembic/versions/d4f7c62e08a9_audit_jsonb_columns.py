@@ -0,0 +1,46 @@
+"""audit jsonb columns
+
+Revision ID: d4f7c62e08a9
+Revises: b8e21f3a97c5
+Create Date: 2026-09-01 15:21:17.664218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7c62e08a9'
+down_revision: Union[str, None] = 'b8e21f3a97c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # json -> jsonb: parsed once at insert instead of on every read,
+    # and eligible for GIN indexing if metadata queries show up
+    op.alter_column('audit_logs', 'changes',
+                    existing_type=postgresql.JSON(),
+                    type_=postgresql.JSONB(),
+                    existing_nullable=True,
+                    postgresql_using='changes::jsonb')
+    op.alter_column('audit_logs', 'audit_metadata',
+                    existing_type=postgresql.JSON(),
+                    type_=postgresql.JSONB(),
+                    server_default=sa.text("'{}'::jsonb"),
+                    postgresql_using='audit_metadata::jsonb')
+
+
+def downgrade() -> None:
+    op.alter_column('audit_logs', 'audit_metadata',
+                    existing_type=postgresql.JSONB(),
+                    type_=postgresql.JSON(),
+                    server_default=None,
+                    postgresql_using='audit_metadata::json')
+    op.alter_column('audit_logs', 'changes',
+                    existing_type=postgresql.JSONB(),
+                    type_=postgresql.JSON(),
+                    existing_nullable=True,
+                    postgresql_using='changes::json')
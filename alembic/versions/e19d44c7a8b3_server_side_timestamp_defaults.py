@@ -0,0 +1,39 @@
+"""server-side timestamp defaults
+
+Revision ID: e19d44c7a8b3
+Revises: c7d30b91e6f2
+Create Date: 2026-09-01 11:20:37.445918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e19d44c7a8b3'
+down_revision: Union[str, None] = 'c7d30b91e6f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = [
+    ('audit_logs', 'timestamp'),
+    ('documents', 'created_at'),
+    ('documents', 'updated_at'),
+    ('kyc_applications', 'created_at'),
+    ('kyc_applications', 'updated_at'),
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('verifications', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,42 @@
+"""all verifications passed flag
+
+Revision ID: e8b4a19d73c6
+Revises: d4f7c62e08a9
+Create Date: 2026-09-01 16:42:05.118334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4a19d73c6'
+down_revision: Union[str, None] = 'd4f7c62e08a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized flag maintained by the Verification write events;
+    # workflow transition checks read it instead of scanning the
+    # verifications collection
+    op.add_column(
+        'kyc_applications',
+        sa.Column('all_verifications_passed', sa.Boolean(),
+                  nullable=False, server_default=sa.text('false'))
+    )
+    # Backfill existing rows from their verification history
+    op.execute(
+        "UPDATE kyc_applications k SET all_verifications_passed = ("
+        "  EXISTS (SELECT 1 FROM verifications v WHERE v.kyc_application_id = k.id)"
+        "  AND NOT EXISTS ("
+        "    SELECT 1 FROM verifications v"
+        "    WHERE v.kyc_application_id = k.id AND v.result != 'PASS'"
+        "  )"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('kyc_applications', 'all_verifications_passed')
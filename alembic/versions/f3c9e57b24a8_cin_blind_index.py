@@ -0,0 +1,42 @@
+"""cin blind index
+
+Revision ID: f3c9e57b24a8
+Revises: e8b4a19d73c6
+Create Date: 2026-09-01 17:08:41.552173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9e57b24a8'
+down_revision: Union[str, None] = 'e8b4a19d73c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # HMAC-SHA256 blind index of the encrypted CIN; equality lookups
+    # (duplicate check on create) go through this column. Backfill
+    # requires decrypting existing rows, so it runs app-side with the
+    # encryption key - new rows populate the column on insert.
+    op.add_column(
+        'kyc_applications',
+        sa.Column('cin_number_hash', sa.String(length=64), nullable=True)
+    )
+    op.create_index('ix_kyc_cin_hash', 'kyc_applications', ['cin_number_hash'])
+    # At most one active application per CIN, enforced when a second
+    # one reaches SUBMITTED/APPROVED
+    op.create_index(
+        'uq_kyc_cin_hash_active', 'kyc_applications', ['cin_number_hash'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('APPROVED', 'SUBMITTED')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_kyc_cin_hash_active', table_name='kyc_applications')
+    op.drop_index('ix_kyc_cin_hash', table_name='kyc_applications')
+    op.drop_column('kyc_applications', 'cin_number_hash')
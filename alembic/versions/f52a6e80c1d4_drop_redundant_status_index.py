@@ -0,0 +1,27 @@
+"""drop redundant status index
+
+Revision ID: f52a6e80c1d4
+Revises: e19d44c7a8b3
+Create Date: 2026-09-01 11:35:02.918264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f52a6e80c1d4'
+down_revision: Union[str, None] = 'e19d44c7a8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ix_kyc_status_created leads with status, so the single-column
+    # index only adds write amplification
+    op.drop_index('ix_kyc_applications_status', table_name='kyc_applications')
+
+
+def downgrade() -> None:
+    op.create_index('ix_kyc_applications_status', 'kyc_applications', ['status'], unique=False)
@@ -0,0 +1,46 @@
+"""
+Off-event-loop image decoding
+
+libjpeg decode of a 10 MB photo is 20-80 ms of pure CPU. Running it on
+the event loop thread stalls every concurrent request, so decodes are
+dispatched to a process pool and run in parallel across cores without
+GIL contention.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+
+import cv2
+import numpy as np
+
+# Created lazily so worker processes are only forked when an image
+# actually needs decoding (and never in the pool workers themselves)
+_decode_pool = None
+
+
+def _decode_image_worker(image_bytes: bytes) -> np.ndarray:
+    """Decode image bytes to a BGR ndarray (runs in a pool worker)"""
+    # One core per worker - the pool already fans out across cores,
+    # letting OpenCV spawn threads on top would oversubscribe
+    cv2.setNumThreads(1)
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
+def get_decode_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Get the process pool for image decoding"""
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count()
+        )
+    return _decode_pool
+
+
+async def decode_image_async(image_bytes: bytes) -> np.ndarray:
+    """Decode image bytes off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_decode_pool(), _decode_image_worker, image_bytes
+    )
@@ -29,10 +29,29 @@ Example CIN Layout:
 import cv2
 import numpy as np
 from typing import Dict, Any, Optional
+from datetime import datetime
 import logging
+import re
+
+from app.config import settings, CIN_PATTERN
 
 logger = logging.getLogger(__name__)
 
+# Field patterns compiled once at import. Parsing joins the OCR tokens
+# and runs each compiled pattern in a single C-level scan over the full
+# text - no per-token Python loop, no recompilation per document.
+_CIN_NUMBER_RE = re.compile(r"\b[A-Z]{1,2}\d{6,7}\b")
+_DATE_RE = re.compile(r"\b\d{2}/\d{2}/\d{4}\b")
+_LAST_NAME_RE = re.compile(r"(?:Nom|الاسم العائلي)\s*:?\s*([A-ZÀ-Ü][A-ZÀ-Ü\- ]+)", re.IGNORECASE)
+_FIRST_NAME_RE = re.compile(r"(?:Pr[ée]nom|الاسم الشخصي)\s*:?\s*([A-ZÀ-Ü][A-ZÀ-Ü\- ]+)", re.IGNORECASE)
+_PLACE_RE = re.compile(r"(?:[àa]\s+|Lieu\s*:?\s*)([A-ZÀ-Ü][A-Za-zà-ü\- ]+)")
+_CIN_FORMAT_RE = CIN_PATTERN
+
+# OCR readers hold ~400 MB of models and lose GPU warmup if rebuilt, so
+# one reader per (engine, languages) is shared across every CINOCREngine
+# instance in the process
+_READER_CACHE: Dict[tuple, Any] = {}
+
 
 class CINOCREngine:
     """OCR Engine for Moroccan CIN cards"""
@@ -45,18 +64,35 @@ class CINOCREngine:
             engine: "easyocr", "paddleocr", or "tesseract"
         """
         self.engine = engine
+        # CLAHE instance is reusable; building it per image wastes a call
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
         self._initialize_engine()
     
     def _initialize_engine(self):
         """
-        TODO: Initialize your chosen OCR engine here
-        
-        Example for EasyOCR:
-            import easyocr
-            self.reader = easyocr.Reader(['ar', 'fr', 'en'], gpu=True)
+        Initialize the OCR reader (process-wide singleton)
+
+        Re-instantiating CINOCREngine reuses the cached reader instead of
+        reloading model weights. A warmup readtext on a dummy image runs
+        once at load so the first real document does not pay the CUDA
+        autotune / lazy-JIT cost ("first call is 10x slower").
         """
-        # YOUR CODE HERE
-        pass
+        key = (self.engine, tuple(settings.OCR_LANGUAGES))
+        reader = _READER_CACHE.get(key)
+
+        if reader is None and self.engine == "easyocr":
+            try:
+                import easyocr
+            except ImportError:
+                logger.warning("easyocr not installed - OCR reader unavailable")
+            else:
+                reader = easyocr.Reader(list(settings.OCR_LANGUAGES), gpu=True)
+                # Warmup forward pass
+                reader.readtext(np.zeros((64, 64, 3), dtype=np.uint8))
+                _READER_CACHE[key] = reader
+                logger.info("EasyOCR reader initialized and warmed up")
+
+        self.reader = reader
     
     def extract_from_cin_front(self, image_bytes: bytes) -> Dict[str, Any]:
         """
@@ -89,50 +125,146 @@ class CINOCREngine:
     
     def _preprocess_image(self, image_bytes: bytes) -> np.ndarray:
         """
-        TODO: Implement image preprocessing
-        
-        Steps:
-        1. Convert to grayscale
-        2. Deskew (fix rotation)
-        3. Enhance contrast
-        4. Denoise
-        5. Resize to optimal size
+        Preprocess CIN image for OCR as one fused pipeline
+
+        Grayscale -> denoise -> contrast-enhance run back-to-back on a
+        single reused scratch buffer instead of allocating a fresh
+        ndarray per step (a 3000x2000 scan is ~6 MB, so every extra pass
+        is real DRAM traffic). The skew angle is estimated on a 1/4-size
+        copy - 16x cheaper - and applied with one warpAffine at the end.
         """
-        # YOUR CODE HERE
-        pass
+        nparr = np.frombuffer(image_bytes, np.uint8)
+        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Could not decode image bytes")
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        # bilateralFilter cannot run in-place, so ping-pong between gray
+        # and one scratch buffer; CLAHE writes back into gray
+        work = np.empty_like(gray)
+        cv2.bilateralFilter(gray, 5, 50, 50, dst=work)
+        self._clahe.apply(work, gray)
+
+        angle = self._estimate_skew_angle(gray)
+        if abs(angle) > 0.5:
+            height, width = gray.shape
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            gray = cv2.warpAffine(
+                gray, matrix, (width, height),
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_REPLICATE
+            )
+
+        return gray
+
+    def _estimate_skew_angle(self, gray: np.ndarray) -> float:
+        """Estimate document skew from text baselines on a 1/4-size copy"""
+        small = cv2.resize(gray, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA)
+        edges = cv2.Canny(small, 50, 150)
+        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
+        if lines is None:
+            return 0.0
+
+        # Keep near-horizontal lines only (text rows, card edges)
+        angles = np.degrees(lines[:, 0, 1]) - 90.0
+        angles = angles[np.abs(angles) < 15.0]
+        if angles.size == 0:
+            return 0.0
+        return float(np.median(angles))
     
     def _run_ocr(self, image: np.ndarray) -> list:
         """
-        TODO: Run OCR on preprocessed image
-        
-        Should return list of detected text with coordinates
+        Run OCR on preprocessed image
+
+        Returns list of (bbox, text, confidence) tuples
         """
-        # YOUR CODE HERE
-        pass
-    
+        if self.reader is None:
+            logger.warning("OCR reader not available - returning empty result")
+            return []
+        return self.reader.readtext(image)
+
     def _parse_cin_data(self, ocr_result: list) -> Dict[str, Any]:
         """
-        TODO: Parse OCR results into structured data
-        
-        Use regex patterns to find:
-        - CIN number: [A-Z]{1,2}\d{6,7}
-        - Date: DD/MM/YYYY
-        - Names: After keywords "Nom:", "الاسم:"
+        Parse OCR results into structured data
+
+        Joins all tokens into one string and runs each precompiled
+        pattern once over it, instead of looping patterns x tokens in
+        Python.
         """
-        # YOUR CODE HERE
-        pass
-    
+        texts = []
+        confidences = []
+        for item in ocr_result:
+            # easyocr format: (bbox, text, confidence)
+            if isinstance(item, (tuple, list)) and len(item) >= 3:
+                texts.append(str(item[1]))
+                confidences.append(float(item[2]))
+            else:
+                texts.append(str(item))
+
+        joined = "\n".join(texts)
+
+        cin_match = _CIN_NUMBER_RE.search(joined)
+        last_name_match = _LAST_NAME_RE.search(joined)
+        first_name_match = _FIRST_NAME_RE.search(joined)
+        place_match = _PLACE_RE.search(joined)
+
+        # Dates appear as DD/MM/YYYY; birth date precedes expiry on the card
+        dates = []
+        for raw in _DATE_RE.findall(joined):
+            try:
+                dates.append(datetime.strptime(raw, "%d/%m/%Y").date())
+            except ValueError:
+                continue
+        dates.sort()
+
+        return {
+            "cin_number": cin_match.group(0) if cin_match else None,
+            "first_name": first_name_match.group(1).strip() if first_name_match else None,
+            "last_name": last_name_match.group(1).strip() if last_name_match else None,
+            "date_of_birth": dates[0].isoformat() if dates else None,
+            "expiry_date": dates[-1].isoformat() if len(dates) > 1 else None,
+            "place_of_birth": place_match.group(1).strip() if place_match else None,
+            "raw_text": joined,
+            "confidence": float(np.mean(confidences)) if confidences else 0.0
+        }
+
     def _validate_cin_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        TODO: Validate extracted data
-        
+        Validate extracted data
+
         Check:
         - CIN number format is correct
         - Date is valid
         - Required fields are present
         """
-        # YOUR CODE HERE
-        pass
+        errors = []
+        warnings = []
+
+        cin_number = data.get("cin_number")
+        if not cin_number:
+            errors.append("CIN number not found")
+        elif not _CIN_FORMAT_RE.match(cin_number):
+            errors.append(f"CIN number format invalid: {cin_number}")
+
+        if not data.get("date_of_birth"):
+            errors.append("Date of birth not found")
+
+        if not data.get("first_name") or not data.get("last_name"):
+            warnings.append("Full name could not be extracted")
+
+        if data.get("confidence", 0.0) < 0.5:
+            warnings.append("Low OCR confidence")
+
+        return {
+            **data,
+            "validation": {
+                "is_valid": len(errors) == 0,
+                "errors": errors,
+                "warnings": warnings,
+                "confidence": data.get("confidence", 0.0)
+            }
+        }
 
 
 # Global instance
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 from pydantic import BaseModel, EmailStr
 
-from app.dependencies import get_db, require_admin
+from app.dependencies import get_db, require_admin, pagination_params
 from app.models.user import User, UserRole, UserStatus
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.schemas.user import UserResponse, UserCreate
 
 router = APIRouter()
@@ -37,7 +38,7 @@ async def create_user(
         username=user_data.username,
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         role=user_data.role if hasattr(user_data, 'role') else UserRole.AGENT,
         created_by=current_user.id
     )
@@ -51,14 +52,30 @@ async def create_user(
 
 @router.get("/users", response_model=List[UserResponse])
 async def list_users(
+    pagination: dict = Depends(pagination_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     List all users (admin only)
     """
-    
-    users = db.query(User).all()
+
+    # Project only the response columns - never pull hashed_password or
+    # mfa_secret off the wire, and page instead of loading every row
+    users = db.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.full_name,
+            User.role,
+            User.status,
+            User.is_active,
+        )
+        .order_by(User.username)
+        .offset(pagination["skip"])
+        .limit(pagination["limit"])
+    ).all()
     return users
 
 
@@ -73,7 +90,8 @@ async def update_user_status(
     Update user status (activate/deactivate/suspend)
     """
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Primary-key lookup: hits the identity map and skips Query construction
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -95,32 +113,34 @@ async def get_system_stats(
     """
     
     from app.models.kyc_application import KYCApplication, KYCStatus
-    from sqlalchemy import func
-    
-    # Total applications
-    total_applications = db.query(func.count(KYCApplication.id)).scalar()
-    
-    # By status
+    from sqlalchemy import func, select
+    from datetime import datetime
+
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0)
+
+    # Total / pending / today in one scan using filtered aggregates
+    # instead of three separate round trips
+    counts = db.execute(
+        select(
+            func.count().label("total"),
+            func.count().filter(
+                KYCApplication.status == KYCStatus.MANUAL_REVIEW
+            ).label("pending_review"),
+            func.count().filter(
+                KYCApplication.created_at >= today_start
+            ).label("today_submissions"),
+        ).select_from(KYCApplication)
+    ).one()
+
+    # Status breakdown needs a GROUP BY, so it stays a second query
     status_counts = db.query(
         KYCApplication.status,
         func.count(KYCApplication.id)
     ).group_by(KYCApplication.status).all()
-    
-    # Pending review
-    pending_review = db.query(func.count(KYCApplication.id)).filter(
-        KYCApplication.status == KYCStatus.MANUAL_REVIEW
-    ).scalar()
-    
-    # Today's submissions
-    from datetime import datetime, timedelta
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0)
-    today_submissions = db.query(func.count(KYCApplication.id)).filter(
-        KYCApplication.created_at >= today_start
-    ).scalar()
-    
+
     return {
-        "total_applications": total_applications,
+        "total_applications": counts.total,
         "status_breakdown": {status: count for status, count in status_counts},
-        "pending_review": pending_review,
-        "today_submissions": today_submissions
+        "pending_review": counts.pending_review,
+        "today_submissions": counts.today_submissions
     }
\ No newline at end of file
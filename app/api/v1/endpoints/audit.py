@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.dependencies import get_db, require_auditor, pagination_params
+from app.dependencies import require_auditor, pagination_params
+from app.models.database import get_async_db
 from app.models.user import User
 from app.services.audit_service import AuditService
 from app.schemas.audit import AuditLogResponse
@@ -16,7 +17,7 @@ router = APIRouter()
 @router.get("/applications/{application_id}/trail", response_model=List[AuditLogResponse])
 async def get_application_audit_trail(
     application_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_auditor),
     pagination: dict = Depends(pagination_params)
 ):
@@ -41,7 +42,7 @@ async def get_user_activity(
     user_id: UUID,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_auditor)
 ):
     """
@@ -8,14 +8,19 @@ import logging
 from app.models.database import get_db
 from app.models.user import User, UserRole, UserStatus
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decode_token,
     generate_api_key
 )
-from app.dependencies import get_current_user
+from app.core.rate_limit import (
+    check_login_rate,
+    is_negative_cached,
+    negative_cache_username
+)
+from app.dependencies import get_current_user, get_ip_address, invalidate_user_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -62,11 +67,27 @@ async def login(
     """
     Authenticate user and return JWT tokens
     """
-    
+
+    # Cheap guards first: per-IP rate limit, then the negative cache of
+    # recently-missed usernames - neither costs a DB hit or bcrypt call
+    ip_address = await get_ip_address(request)
+    if not check_login_rate(ip_address):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later."
+        )
+
+    if is_negative_cached(credentials.username):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password"
+        )
+
     # Find user
     user = db.query(User).filter(User.username == credentials.username).first()
-    
+
     if not user:
+        negative_cache_username(credentials.username)
         logger.warning(f"Failed login attempt for username: {credentials.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -80,17 +101,28 @@ async def login(
             detail="Account is locked. Contact administrator."
         )
     
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
-        user.failed_login_attempts += 1
-        
-        # Lock account after 5 failed attempts
-        if user.failed_login_attempts >= 5:
-            user.status = UserStatus.LOCKED
-            logger.warning(f"Account locked due to failed login attempts: {user.username}")
-        
+    # Verify password (off the event loop - bcrypt is ~100 ms of CPU)
+    if not await verify_password_async(credentials.password, user.hashed_password):
+        # Increment the counter and lock after 5 failures in a single
+        # UPDATE ... RETURNING round trip
+        from sqlalchemy import case, update
+        attempts = db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(
+                failed_login_attempts=User.failed_login_attempts + 1,
+                status=case(
+                    (User.failed_login_attempts + 1 >= 5, UserStatus.LOCKED),
+                    else_=User.status,
+                ),
+            )
+            .returning(User.failed_login_attempts)
+        ).scalar_one()
         db.commit()
-        
+
+        if attempts >= 5:
+            logger.warning(f"Account locked due to failed login attempts: {user.username}")
+
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -147,7 +179,13 @@ async def refresh_token(
             )
         
         user_id = payload.get("sub")
-        user = db.query(User).filter(User.id == user_id).first()
+        # Project just the token fields - no need to hydrate the full
+        # ORM user on every refresh hit
+        from sqlalchemy import select
+        user = db.execute(
+            select(User.id, User.username, User.role, User.is_active)
+            .where(User.id == user_id)
+        ).one_or_none()
         
         if not user or not user.is_active:
             raise HTTPException(
@@ -189,8 +227,8 @@ async def change_password(
     Change user password
     """
     
-    # Verify old password
-    if not verify_password(request.old_password, current_user.hashed_password):
+    # Verify old password (off the event loop - bcrypt is ~100 ms of CPU)
+    if not await verify_password_async(request.old_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
@@ -203,11 +241,21 @@ async def change_password(
             detail=f"Password must be at least {settings.PASSWORD_MIN_LENGTH} characters"
         )
     
-    # Update password
-    current_user.hashed_password = hash_password(request.new_password)
+    # Update password with a direct UPDATE: current_user may be a
+    # detached cache entry, so mutating it would never reach this
+    # session's flush
     from datetime import datetime
-    current_user.password_changed_at = datetime.utcnow()
+    from sqlalchemy import update
+    db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(
+            hashed_password=await hash_password_async(request.new_password),
+            password_changed_at=datetime.utcnow(),
+        )
+    )
     db.commit()
+    invalidate_user_cache(current_user.id)
     
     logger.info(f"Password changed for user: {current_user.username}")
     
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
-import io
 import logging
 
-from app.dependencies import get_db, get_current_user, get_ip_address
+from app.dependencies import get_current_user, get_ip_address
+from app.models.database import get_async_db
 from app.models.user import User
 from app.models.document import DocumentType
 from app.schemas.document import DocumentResponse, DocumentUploadResponse
@@ -23,7 +23,7 @@ async def upload_document(
     application_id: UUID = Form(...),
     document_type: DocumentType = Form(...),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     ip_address: str = Depends(get_ip_address)
 ):
     """
@@ -44,14 +44,12 @@ async def upload_document(
     service = DocumentService(db)
     
     try:
-        # Read file content
-        file_content = await file.read()
-        
-        # Upload document
+        # Hand the spooled temp file to the service; it is hashed,
+        # scanned and stored chunk-wise without buffering in memory
         document = await service.upload_document(
             application_id=application_id,
             document_type=document_type,
-            file_content=file_content,
+            file_obj=file.file,
             filename=file.filename,
             ip_address=ip_address
         )
@@ -79,7 +77,7 @@ async def upload_document(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document_info(
     document_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -111,7 +109,7 @@ async def get_document_info(
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -129,15 +127,13 @@ async def download_document(
             user_id=current_user.id
         )
         
-        # Download file
-        file_content = await service.download_document(
-            document_id=document_id,
-            user_id=current_user.id
-        )
-        
-        # Return as streaming response
+        # Stream straight from storage - no BytesIO buffer of the
+        # whole file before the first byte goes out
         return StreamingResponse(
-            io.BytesIO(file_content),
+            service.stream_document(
+                document_id=document_id,
+                user_id=current_user.id
+            ),
             media_type="application/octet-stream",
             headers={
                 "Content-Disposition": f"attachment; filename={document_data['filename']}"
@@ -157,7 +153,7 @@ async def download_document(
 @router.post("/{document_id}/reprocess")
 async def reprocess_document(
     document_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 import logging
 
 from app.dependencies import (
-    get_db,
     get_current_user,
     get_ip_address,
     get_user_agent,
@@ -20,8 +20,10 @@ from app.schemas.kyc import (
     KYCApplicationDetail,
     KYCApprovalRequest,
     KYCRejectionRequest,
-    KYCListResponse
+    KYCListResponse,
+    KYC_LIST_ADAPTER
 )
+from app.models.database import get_async_db
 from app.services.kyc_service import KYCService
 from app.core.exceptions import KYCException
 
@@ -34,7 +36,7 @@ router = APIRouter()
 async def create_kyc_application(
     data: KYCApplicationCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     ip_address: str = Depends(get_ip_address),
     user_agent: str = Depends(get_user_agent)
 ):
@@ -53,14 +55,14 @@ async def create_kyc_application(
             user_agent=user_agent
         )
         
-        logger.info(f"KYC application created: {application.application_number}")
+        logger.info("KYC application created: %s", application.application_number)
         
         return application
         
     except KYCException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error creating KYC application: {str(e)}")
+        logger.error("Error creating KYC application: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create application"
@@ -70,7 +72,7 @@ async def create_kyc_application(
 @router.get("/applications/{application_id}", response_model=KYCApplicationDetail)
 async def get_kyc_application(
     application_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -86,13 +88,16 @@ async def get_kyc_application(
             application_id=application_id,
             user=current_user
         )
-        
-        return application_data
+
+        # The service already shapes (and caches) a JSON-safe dict;
+        # returning a Response directly hands it to orjson and skips
+        # the response_model re-validation pass
+        return ORJSONResponse(application_data)
         
     except KYCException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error retrieving application: {str(e)}")
+        logger.error("Error retrieving application: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve application"
@@ -103,7 +108,7 @@ async def get_kyc_application(
 async def list_kyc_applications(
     status: Optional[str] = None,
     risk_level: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_agent),
     pagination: dict = Depends(pagination_params)
 ):
@@ -116,41 +121,31 @@ async def list_kyc_applications(
     from app.repositories.kyc_repo import KYCRepository
     
     repo = KYCRepository(db)
-    
-    # Build filters
-    filters = {}
-    if status:
-        filters['status'] = status
-    if risk_level:
-        filters['risk_level'] = risk_level
-    
-    # Get applications
-    if status:
-        applications = repo.get_by_status(
-            status=status,
-            skip=pagination['skip'],
-            limit=pagination['limit']
-        )
-    else:
-        applications = repo.get_all(
-            skip=pagination['skip'],
-            limit=pagination['limit']
-        )
-    
-    total = repo.count(filters)
-    
-    return {
+
+    # Single query: page rows plus a windowed total count
+    applications, total = await repo.list_paginated(
+        status=status,
+        risk_level=risk_level,
+        skip=pagination['skip'],
+        limit=pagination['limit']
+    )
+
+    # Dump through the prebuilt adapter and return a Response directly,
+    # skipping FastAPI's per-call response_model re-validation
+    page_rows = KYC_LIST_ADAPTER.validate_python(applications, from_attributes=True)
+
+    return ORJSONResponse({
         "total": total,
         "page": pagination['skip'] // pagination['limit'] + 1,
         "page_size": pagination['limit'],
-        "applications": applications
-    }
+        "applications": KYC_LIST_ADAPTER.dump_python(page_rows, mode="json")
+    })
 
 
 @router.post("/applications/{application_id}/submit", response_model=KYCApplicationResponse)
 async def submit_kyc_application(
     application_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     ip_address: str = Depends(get_ip_address)
 ):
     """
@@ -167,14 +162,14 @@ async def submit_kyc_application(
             ip_address=ip_address
         )
         
-        logger.info(f"Application submitted: {application.application_number}")
+        logger.info("Application submitted: %s", application.application_number)
         
         return application
         
     except KYCException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error submitting application: {str(e)}")
+        logger.error("Error submitting application: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to submit application"
@@ -185,7 +180,7 @@ async def submit_kyc_application(
 async def approve_kyc_application(
     application_id: UUID,
     approval_data: KYCApprovalRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_agent)
 ):
     """
@@ -203,14 +198,14 @@ async def approve_kyc_application(
             notes=approval_data.notes
         )
         
-        logger.info(f"Application approved: {application.application_number} by {current_user.username}")
+        logger.info("Application approved: %s by %s", application.application_number, current_user.username)
         
         return application
         
     except KYCException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error approving application: {str(e)}")
+        logger.error("Error approving application: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to approve application"
@@ -221,7 +216,7 @@ async def approve_kyc_application(
 async def reject_kyc_application(
     application_id: UUID,
     rejection_data: KYCRejectionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_agent)
 ):
     """
@@ -240,14 +235,14 @@ async def reject_kyc_application(
             notes=rejection_data.notes
         )
         
-        logger.info(f"Application rejected: {application.application_number} by {current_user.username}")
+        logger.info("Application rejected: %s by %s", application.application_number, current_user.username)
         
         return application
         
     except KYCException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error rejecting application: {str(e)}")
+        logger.error("Error rejecting application: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to reject application"
@@ -256,27 +251,31 @@ async def reject_kyc_application(
 
 @router.get("/applications/pending-review", response_model=List[KYCApplicationResponse])
 async def get_pending_review_applications(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_agent),
     pagination: dict = Depends(pagination_params)
 ):
     """
     Get applications pending manual review
-    
+
     Returns applications assigned to current agent or unassigned (for supervisors/admins)
     """
-    
+
     from app.repositories.kyc_repo import KYCRepository
-    
+
     repo = KYCRepository(db)
-    
+
     # Supervisors and admins see all, agents see only their assignments
     agent_id = None if current_user.role in ["admin", "supervisor"] else current_user.id
-    
-    applications = repo.get_pending_review(
+
+    applications = await repo.get_pending_review(
         agent_id=agent_id,
         skip=pagination['skip'],
         limit=pagination['limit']
     )
-    
-    return applications
\ No newline at end of file
+
+    # Same outbound fast path as the list endpoint: prebuilt adapter +
+    # direct Response, no per-call response_model re-validation
+    page_rows = KYC_LIST_ADAPTER.validate_python(applications, from_attributes=True)
+
+    return ORJSONResponse(KYC_LIST_ADAPTER.dump_python(page_rows, mode="json"))
\ No newline at end of file
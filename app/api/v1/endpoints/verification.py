@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 from pydantic import BaseModel
 import logging
 
-from app.dependencies import get_db, get_current_user, require_agent
+from app.models.database import get_async_db
+from app.config import settings
+from app.core.cache import get_json, set_json, invalidate_prefix
+from app.dependencies import get_current_user, require_agent
 from app.models.user import User
 from app.models.verification import Verification
 from app.schemas.verification import VerificationResponse
@@ -32,7 +36,7 @@ class FaceVerificationResponse(BaseModel):
 @router.post("/face-match", response_model=FaceVerificationResponse)
 async def verify_face_match(
     request: FaceVerificationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_agent)
 ):
     """
@@ -48,7 +52,9 @@ async def verify_face_match(
         # Get application documents
         from app.repositories.kyc_repo import KYCRepository
         repo = KYCRepository(db)
-        application = repo.get_by_id(request.application_id)
+        # Documents are iterated below - eager-load them in the same
+        # round trip instead of lazy-loading per access
+        application = await repo.get_with_documents(request.application_id)
         
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
@@ -89,9 +95,13 @@ async def verify_face_match(
         
         # Update application
         application.face_verification_score = result['similarity_score']
-        db.commit()
-        
-        logger.info(f"Face verification completed for application {request.application_id}: {result['is_match']}")
+        await db.commit()
+
+        # New verification row - drop cached verification lists
+        await invalidate_prefix(f"verif:{request.application_id}:")
+
+
+        logger.info("Face verification completed for application %s: %s", request.application_id, result['is_match'])
         
         return {
             "application_id": str(request.application_id),
@@ -101,7 +111,7 @@ async def verify_face_match(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in face verification: {str(e)}")
+        logger.error("Error in face verification: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to perform face verification"
@@ -111,15 +121,31 @@ async def verify_face_match(
 @router.get("/applications/{application_id}/verifications", response_model=List[VerificationResponse])
 async def get_application_verifications(
     application_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all verification results for an application
     """
-    
-    verifications = db.query(Verification).filter(
-        Verification.kyc_application_id == application_id
-    ).all()
-    
-    return verifications
\ No newline at end of file
+
+    # Read-heavy polling endpoint: serve repeats from the short-TTL
+    # cache when Redis is available
+    cache_key = f"verif:{application_id}:{current_user.id}"
+    cached = await get_json(cache_key)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(Verification).where(
+            Verification.kyc_application_id == application_id
+        )
+    )
+    verifications = result.scalars().all()
+
+    payload = [
+        VerificationResponse.model_validate(v).model_dump(mode="json")
+        for v in verifications
+    ]
+    await set_json(cache_key, payload, settings.VERIFICATIONS_CACHE_TTL_SECONDS)
+
+    return payload
\ No newline at end of file
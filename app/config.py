@@ -2,7 +2,7 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional, List
-import secrets
+import re
 
 
 class Settings(BaseSettings):
@@ -14,12 +14,18 @@ class Settings(BaseSettings):
 
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "./logs/app.log"
+    # Access-log sampling for high-churn probe endpoints; business
+    # endpoints are always logged
+    HIGH_TRAFFIC_PATHS: List[str] = ["/health"]
+    LOG_SAMPLE_RATE: float = 0.01
     
     # API
     API_V1_PREFIX: str = "/api/v1"
     
     # Security
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Must come from the environment: a generated default would differ
+    # per worker process and invalidate tokens across the pool
+    SECRET_KEY: str
     ENCRYPTION_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -34,6 +40,16 @@ class Settings(BaseSettings):
     # Redis - OPTIONAL (set to None if not using)
     REDIS_URL: Optional[str] = None
     REDIS_ENABLED: bool = False
+
+    # Login abuse guards (active only when Redis is enabled)
+    LOGIN_RATE_LIMIT_PER_MINUTE: int = 10
+    NEGATIVE_CACHE_TTL_SECONDS: int = 300
+
+    # Response cache (active only when Redis is enabled)
+    VERIFICATIONS_CACHE_TTL_SECONDS: int = 30
+    # Application-details responses are keyed by updated_at, so stale
+    # versions simply TTL out and the window can be generous
+    APPLICATION_CACHE_TTL_SECONDS: int = 300
     
     # Storage
     STORAGE_TYPE: str = "local"
@@ -64,9 +80,16 @@ class Settings(BaseSettings):
     
     # AI Models
     FACE_RECOGNITION_MODEL: str = "facenet"
+    FACE_EMBEDDING_MODEL_PATH: str = "./models/arcface.onnx"
     LIVENESS_DETECTION_ENABLED: bool = True
     MIN_FACE_MATCH_SCORE: float = 0.90
+    # Compare int8-quantized embeddings (VNNI kernels); disable to
+    # re-verify with full FP32 precision
+    FACE_EMBEDDING_INT8: bool = True
     
+    # Compliance
+    AUDIT_LOG_RETENTION_DAYS: int = 2555  # 7 years
+
     # KYC
     CIN_REGEX: str = r"^[A-Z]{1,2}\d{6,7}$"
     AUTO_APPROVE_THRESHOLD: float = 0.95
@@ -84,4 +107,8 @@ def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings()
\ No newline at end of file
+settings = get_settings()
+
+# Compiled once at import - validators and the OCR parser match CINs on
+# every application, so nobody should pay re.compile per call
+CIN_PATTERN = re.compile(settings.CIN_REGEX)
\ No newline at end of file
@@ -0,0 +1,102 @@
+# app/core/cache.py
+"""
+Redis-backed response cache for read-heavy idempotent endpoints
+
+Frontends poll the verification list while a case is open; a short TTL
+cache absorbs those repeats without a database round-trip. Same
+fail-open contract as the rate limiter: when Redis is missing or a
+call errors, reads miss and writes are dropped, so correctness never
+depends on the cache tier.
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as redis_async
+except ImportError:
+    redis_async = None
+
+_client = None
+
+
+def _get_client():
+    """Lazily create the async Redis client (None when not in use)"""
+    global _client
+    if _client is None and redis_async is not None \
+            and settings.REDIS_ENABLED and settings.REDIS_URL:
+        _client = redis_async.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+async def get_json(key: str) -> Optional[Any]:
+    """Fetch and deserialize a cached value, or None on miss"""
+    client = _get_client()
+    if client is None:
+        return None
+
+    try:
+        cached = await client.get(key)
+        return json.loads(cached) if cached is not None else None
+    except Exception as e:
+        logger.warning(f"Cache read failed (treating as miss): {e}")
+        return None
+
+
+async def set_json(key: str, value: Any, ttl_seconds: int):
+    """Serialize and store a value with a TTL"""
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        await client.setex(key, ttl_seconds, json.dumps(value, default=str))
+    except Exception as e:
+        logger.warning(f"Cache write failed: {e}")
+
+
+async def bump_counter(key: str, ttl_seconds: int):
+    """Increment a windowed counter, (re)arming its TTL"""
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Counter bump failed: {e}")
+
+
+async def get_counter(key: str) -> Optional[int]:
+    """Read a counter; None means Redis is unavailable (not zero)"""
+    client = _get_client()
+    if client is None:
+        return None
+
+    try:
+        value = await client.get(key)
+        return int(value) if value is not None else 0
+    except Exception as e:
+        logger.warning(f"Counter read failed: {e}")
+        return None
+
+
+async def invalidate_prefix(prefix: str):
+    """Drop every key under a prefix (used after writes)"""
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        async for key in client.scan_iter(match=f"{prefix}*"):
+            await client.delete(key)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed: {e}")
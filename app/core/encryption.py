@@ -1,58 +1,133 @@
 # app/core/encryption.py
-from cryptography.fernet import Fernet
-from typing import Optional
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from typing import Iterable, Optional
 import base64
+import hmac
+import hashlib
+import os
 
 from app.config import settings
 
+NONCE_SIZE = 12
+
 
 class FieldEncryption:
     """Field-level encryption for sensitive data"""
-    
+
     def __init__(self):
         # In production, use key management service (KMS)
-        self.cipher = Fernet(settings.ENCRYPTION_KEY.encode())
-    
+        # ENCRYPTION_KEY is a Fernet key: urlsafe base64 of 32 bytes.
+        # Decode it and drive AES-256-GCM directly - one AEAD pass with
+        # hardware AES instead of Fernet's CBC + separate HMAC.
+        key = base64.urlsafe_b64decode(settings.ENCRYPTION_KEY.encode())
+        self._key = key
+        self.aead = AESGCM(key)
+        # Legacy cipher kept for decrypting rows written before the
+        # AES-GCM switch
+        self._legacy_cipher = Fernet(settings.ENCRYPTION_KEY.encode())
+
     def encrypt(self, value: str) -> str:
         """Encrypt a string value"""
         if not value:
             return value
-        
-        encrypted = self.cipher.encrypt(value.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
-    
+
+        nonce = os.urandom(NONCE_SIZE)
+        ciphertext = self.aead.encrypt(nonce, value.encode(), None)
+        return base64.urlsafe_b64encode(nonce + ciphertext).decode()
+
     def decrypt(self, encrypted_value: str) -> str:
         """Decrypt an encrypted value"""
         if not encrypted_value:
             return encrypted_value
-        
+
         decoded = base64.urlsafe_b64decode(encrypted_value.encode())
-        decrypted = self.cipher.decrypt(decoded)
-        return decrypted.decode()
-    
-    def encrypt_dict(self, data: dict, fields: list) -> dict:
+        try:
+            return self.aead.decrypt(
+                decoded[:NONCE_SIZE], decoded[NONCE_SIZE:], None
+            ).decode()
+        except Exception:
+            # Legacy row: doubly-base64-encoded Fernet token
+            return self._legacy_cipher.decrypt(decoded).decode()
+
+    def blind_index(self, value: str) -> str:
+        """Deterministic keyed hash of a plaintext for equality lookups
+
+        AES-GCM ciphertext is nonce-randomized, so encrypted columns
+        cannot be compared or indexed. HMAC-SHA256 under the same key
+        gives a stable 64-char hex token that supports exact-match
+        queries without revealing the plaintext.
+        """
+        if not value:
+            return value
+        return hmac.new(self._key, value.encode(), hashlib.sha256).hexdigest()
+
+    def reencrypt_legacy(self, encrypted_value: str) -> str:
+        """Re-encrypt a legacy value into the compact AES-GCM format
+
+        The old encrypt path base64-encoded the Fernet token a second
+        time even though Fernet output is already base64, inflating
+        stored ciphertext ~1.78x. Intended for a one-time migration
+        over the ENCRYPTED_FIELDS columns; returns the value unchanged
+        if it is already in the new format.
+        """
+        if not encrypted_value:
+            return encrypted_value
+
+        decoded = base64.urlsafe_b64decode(encrypted_value.encode())
+        try:
+            self.aead.decrypt(decoded[:NONCE_SIZE], decoded[NONCE_SIZE:], None)
+            return encrypted_value
+        except Exception:
+            pass
+
+        return self.encrypt(self._legacy_cipher.decrypt(decoded).decode())
+
+    def encrypt_dict(self, data: dict, fields: Iterable[str], in_place: bool = False) -> dict:
         """Encrypt specific fields in a dictionary"""
-        encrypted_data = data.copy()
+        encrypted_data = data if in_place else data.copy()
         for field in fields:
             if field in encrypted_data and encrypted_data[field]:
                 encrypted_data[field] = self.encrypt(str(encrypted_data[field]))
         return encrypted_data
-    
-    def decrypt_dict(self, data: dict, fields: list) -> dict:
+
+    def decrypt_dict(self, data: dict, fields: Iterable[str], in_place: bool = False) -> dict:
         """Decrypt specific fields in a dictionary"""
-        decrypted_data = data.copy()
+        decrypted_data = data if in_place else data.copy()
         for field in fields:
             if field in decrypted_data and decrypted_data[field]:
                 decrypted_data[field] = self.decrypt(decrypted_data[field])
         return decrypted_data
 
+    def decrypt_rows(self, rows: list, fields: Iterable[str]) -> list:
+        """Decrypt fields across a list of row dicts, in place
+
+        Single pass for list endpoints: collects the encrypted cells
+        first, decrypts them in one tight loop, then writes back -
+        avoiding a dict copy and per-row method dispatch for every row.
+        """
+        pending = [
+            (row, field)
+            for row in rows
+            for field in fields
+            if row.get(field)
+        ]
+
+        plaintexts = [self.decrypt(row[field]) for row, field in pending]
+
+        for (row, field), plaintext in zip(pending, plaintexts):
+            row[field] = plaintext
+
+        return rows
+
 
 # Global encryption instance
 encryption = FieldEncryption()
 
 
-# Sensitive fields that should be encrypted
-ENCRYPTED_FIELDS = [
+# Sensitive fields that should be encrypted. frozenset: membership
+# checks are O(1) and hit on every row serialized
+ENCRYPTED_FIELDS = frozenset({
     "cin_number",
     "first_name",
     "last_name",
@@ -61,4 +136,4 @@ ENCRYPTED_FIELDS = [
     "phone_number",
     "email",
     "address"
-]
\ No newline at end of file
+})
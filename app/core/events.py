@@ -1,6 +1,6 @@
 #  app/core/events.py
 import logging
-from app.models.database import engine, Base
+from app.models.database import engine, async_engine, Base
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,16 +19,30 @@ async def startup_handler():
     # Connect to external services
     # from app.integrations.storage import storage_service
     # await storage_service.ensure_buckets_exist()
-    
+
+    # Periodic drain of the audit log batch buffer
+    from app.services.audit_service import AuditService
+    AuditService.start_background_flush()
+
     logger.info("System startup complete")
 
 
 async def shutdown_handler():
     """Handle application shutdown"""
     logger.info("Shutting down KYC Backend System...")
-    
+
+    # Stop the drainer, then flush any buffered audit log entries
+    from app.services.audit_service import AuditService
+    await AuditService.stop_background_flush()
+    await AuditService.flush_pending()
+
     # Close database connections
     engine.dispose()
-    
+    await async_engine.dispose()
+
     # Cleanup resources
-    logger.info("Cleanup complete")
\ No newline at end of file
+    logger.info("Cleanup complete")
+
+    # Last: flush and stop the background log writer
+    from app.core.logging_config import shutdown_logging
+    shutdown_logging()
\ No newline at end of file
@@ -0,0 +1,50 @@
+# app/core/logging_config.py
+"""
+Queue-based logging setup
+
+The default FileHandler writes and flushes inline on whatever thread
+emits the record - on the event loop thread that means a disk write
+per log line. Handlers here sit behind a QueueHandler: emitters only
+enqueue, and a background listener thread does the formatting and I/O.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.config import settings
+
+_listener = None
+
+
+def setup_logging():
+    """Route root logging through a queue to a background writer"""
+    global _listener
+
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    file_handler = logging.FileHandler(settings.LOG_FILE)
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, settings.LOG_LEVEL))
+    root.handlers = [QueueHandler(log_queue)]
+
+
+def shutdown_logging():
+    """Flush and stop the background log writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
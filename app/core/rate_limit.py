@@ -0,0 +1,81 @@
+# app/core/rate_limit.py
+"""
+Login abuse guards - rate limiting and negative caching
+
+During credential-stuffing floods every /login costs a DB lookup plus
+~100 ms of bcrypt even though the response is always 401. A per-IP
+counter and a short-lived negative cache of nonexistent usernames keep
+the expensive path for plausible logins only.
+
+Redis-backed and fail-open: when Redis is not configured or a call
+fails, every check passes so login availability never depends on the
+cache tier.
+"""
+
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+_client = None
+
+
+def _get_client():
+    """Lazily create the Redis client (None when Redis is not in use)"""
+    global _client
+    if _client is None and redis is not None \
+            and settings.REDIS_ENABLED and settings.REDIS_URL:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def check_login_rate(ip_address: str) -> bool:
+    """True if this IP is under the per-minute login cap"""
+    client = _get_client()
+    if client is None:
+        return True
+
+    try:
+        key = f"login_rate:{ip_address}"
+        count = client.incr(key)
+        if count == 1:
+            client.expire(key, 60)
+        return count <= settings.LOGIN_RATE_LIMIT_PER_MINUTE
+    except Exception as e:
+        logger.warning(f"Rate limit check failed (allowing request): {e}")
+        return True
+
+
+def is_negative_cached(username: str) -> bool:
+    """True if this username recently failed a DB lookup"""
+    client = _get_client()
+    if client is None:
+        return False
+
+    try:
+        return client.get(f"neg_user:{username}") is not None
+    except Exception as e:
+        logger.warning(f"Negative cache check failed: {e}")
+        return False
+
+
+def negative_cache_username(username: str):
+    """Remember that this username does not exist"""
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        client.setex(
+            f"neg_user:{username}",
+            settings.NEGATIVE_CACHE_TTL_SECONDS,
+            1
+        )
+    except Exception as e:
+        logger.warning(f"Negative cache write failed: {e}")
@@ -1,16 +1,35 @@
 # app/core/security.py
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+import asyncio
+import itertools
+import os
 import secrets
 import hashlib
+import time
 
 from app.config import settings
 
+# Encode the signing key once; PyJWT HMACs these bytes directly via
+# OpenSSL's SHA-256 rather than re-encoding the string per call
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Rounds pinned explicitly (~100 ms on current hardware) instead of
+# accepting whatever the library default drifts to
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+
+# bcrypt is deliberately CPU-heavy; running it on the event loop thread
+# serializes every concurrent login. Hashing calls on async paths go
+# through this pool instead.
+_hash_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count(),
+    thread_name_prefix="pwd-hash"
+)
 
 
 def hash_password(password: str) -> str:
@@ -23,6 +42,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_pool, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -38,7 +71,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         "type": "access"
     })
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -53,16 +86,16 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         "type": "refresh"
     })
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str) -> Dict[str, Any]:
     """Decode and validate JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=[settings.JWT_ALGORITHM])
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
 
 
@@ -76,8 +109,28 @@ def hash_file(file_content: bytes) -> str:
     return hashlib.sha256(file_content).hexdigest()
 
 
+async def hash_stream(stream) -> str:
+    """SHA-256 an async byte stream incrementally
+
+    Feeds chunks straight into hashlib (OpenSSL's hardware SHA path
+    where available) so a 10 MB upload never has to be materialized
+    just to be hashed.
+    """
+    hasher = hashlib.sha256()
+    async for chunk in stream:
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# Application-number sequence: millisecond timestamp + pid + a
+# process-local counter is collision-safe without paying a urandom
+# read and a strftime per create
+_app_number_counter = itertools.count()
+_pid_part = os.getpid() & 0xFFFF
+
+
 def generate_application_number() -> str:
     """Generate unique KYC application number"""
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    random_part = secrets.token_hex(4).upper()
-    return f"KYC-{timestamp}-{random_part}"
\ No newline at end of file
+    timestamp_ms = time.time_ns() // 1_000_000
+    sequence = next(_app_number_counter) & 0xFFFF
+    return f"KYC-{timestamp_ms:013d}-{_pid_part:04X}{sequence:04X}"
\ No newline at end of file
@@ -1,12 +1,15 @@
 # app/dependencies.py
 from typing import List
-from fastapi import Depends, HTTPException, status, Security
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from fastapi import BackgroundTasks, Depends, HTTPException, status, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Query
 from sqlalchemy.orm import Session
-from jose import JWTError
 from uuid import UUID
 import logging
+import time
 
 from app.models.database import get_db
 from app.models.user import User, UserRole
@@ -17,8 +20,43 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# Short-TTL cache of authenticated users so repeat requests with the
+# same token skip the per-call SELECT. Entries are detached instances:
+# reads may lag by up to USER_CACHE_TTL seconds, and writes must go
+# through a direct UPDATE (a detached object has no session to flush),
+# followed by invalidate_user_cache so the stale entry is dropped.
+_USER_CACHE: OrderedDict = OrderedDict()
+USER_CACHE_SIZE = 10000
+USER_CACHE_TTL = 30.0
+LAST_LOGIN_INTERVAL_SECONDS = 300
+
+
+def invalidate_user_cache(user_id) -> None:
+    """Drop a user's cached entry after mutating their row"""
+    _USER_CACHE.pop(str(user_id), None)
+
+
+@lru_cache(maxsize=10000)
+def _parse_user_id(user_id: str) -> UUID:
+    """Memoized str -> UUID parse; tokens repeat the same subject"""
+    return UUID(user_id)
+
+
+def _update_last_login(user_id: UUID):
+    """Write last_login on a fresh session after the response is sent"""
+    from sqlalchemy import update
+    from app.models.database import get_db_context
+
+    with get_db_context() as session:
+        session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(last_login=datetime.utcnow())
+        )
+
 
 async def get_current_user(
+    background_tasks: BackgroundTasks,
     credentials: HTTPAuthorizationCredentials = Security(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -42,26 +80,38 @@ async def get_current_user(
         if token_type != "access":
             raise credentials_exception
             
-    except JWTError as e:
+    except ValueError as e:
         logger.error(f"JWT decode error: {str(e)}")
         raise credentials_exception
-    
-    # Get user from database
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
+
+    # Cache hit: no database work at all on the hot path
+    now = time.monotonic()
+    cached = _USER_CACHE.get(user_id)
+    if cached is not None and cached[1] > now:
+        _USER_CACHE.move_to_end(user_id)
+        return cached[0]
+
+    # Get user from database (PK lookup via identity map)
+    user = db.get(User, _parse_user_id(user_id))
     if user is None:
         raise credentials_exception
-    
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
-    
-    # Update last login
-    from datetime import datetime
-    user.last_login = datetime.utcnow()
-    db.commit()
-    
+
+    # Touch last_login at most once per interval, and only after the
+    # response has gone out - no write transaction on the request path
+    cutoff = datetime.utcnow() - timedelta(seconds=LAST_LOGIN_INTERVAL_SECONDS)
+    if user.last_login is None or user.last_login < cutoff:
+        background_tasks.add_task(_update_last_login, user.id)
+
+    _USER_CACHE[user_id] = (user, now + USER_CACHE_TTL)
+    if len(_USER_CACHE) > USER_CACHE_SIZE:
+        _USER_CACHE.popitem(last=False)
+
     return user
 
 
@@ -77,32 +127,35 @@ async def get_current_active_user(
     return current_user
 
 
-class RoleChecker:
-    """Dependency to check user roles"""
-    
-    def __init__(self, allowed_roles: List[UserRole]):
-        self.allowed_roles = allowed_roles
-    
-    def __call__(self, user: User = Depends(get_current_user)) -> User:
-        if user.role not in self.allowed_roles:
+def make_role_checker(allowed_roles):
+    """Build a role-checking dependency over a frozen set of roles"""
+    allowed_roles = frozenset(allowed_roles)
+
+    async def check_role(user: User = Depends(get_current_user)) -> User:
+        if user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {self.allowed_roles}"
+                detail=f"Insufficient permissions. Required roles: {sorted(r.value for r in allowed_roles)}"
             )
         return user
 
+    return check_role
+
 
 # Role-based dependencies
-require_admin = RoleChecker([UserRole.ADMIN])
-require_agent = RoleChecker([UserRole.ADMIN, UserRole.AGENT, UserRole.SUPERVISOR])
-require_auditor = RoleChecker([UserRole.ADMIN, UserRole.AUDITOR])
+require_admin = make_role_checker({UserRole.ADMIN})
+require_agent = make_role_checker({UserRole.ADMIN, UserRole.AGENT, UserRole.SUPERVISOR})
+require_auditor = make_role_checker({UserRole.ADMIN, UserRole.AUDITOR})
 
 
 async def get_ip_address(request) -> str:
     """Extract client IP address"""
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        # partition avoids the list allocation of split() - the common
+        # case is a single-address header
+        head, _, _ = forwarded.partition(",")
+        return head.strip()
     return request.client.host if request.client else "unknown"
 
 
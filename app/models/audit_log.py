@@ -1,7 +1,8 @@
 # app/models/audit_log.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 
@@ -26,12 +27,14 @@ class AuditLog(Base):
     kyc_application_id = Column(UUID(as_uuid=True), ForeignKey("kyc_applications.id"), nullable=True)
     
     # Details
+    # JSONB: stored pre-parsed and binary on the server, so inserts
+    # skip the text re-serialization and filters can use GIN indexes
     description = Column(String(500))
-    changes = Column(JSON, nullable=True)  # Before/after for updates
-    audit_metadata = Column(JSON, default=dict)
+    changes = Column(JSONB, nullable=True)  # Before/after for updates
+    audit_metadata = Column(JSONB, default=dict, server_default=text("'{}'::jsonb"))
     
     # When
-    timestamp = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     
     # Compliance
     retention_until = Column(DateTime(timezone=True), nullable=True)
@@ -1,11 +1,12 @@
 # app/models/database.py
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from app.config import settings
 
@@ -17,11 +18,48 @@ engine = create_engine(
     poolclass=QueuePool,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
+    # Pre-ping stays on: the sync paths (auth router, get_current_user,
+    # audit writer thread) have no stale-connection retry, so a dropped
+    # connection must be caught at checkout. Recycling every 5 min
+    # keeps idle-timeout churn down so the ping rarely finds a corpse.
+    pool_recycle=300,
     pool_pre_ping=True,
     echo=settings.DB_ECHO,
+    # Default compiled-SQL cache (500) thrashes with the variety of
+    # ad-hoc filters in the repositories
+    query_cache_size=1200,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: objects stay readable after commit instead
+# of re-SELECTing on next attribute access
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Async engine (asyncpg) for endpoints converted to non-blocking DB
+# access. The sync engine above stays until the service layer finishes
+# migrating - both pools point at the same database.
+ASYNC_DATABASE_URL = settings.DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://"
+)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=300,
+    # Only the base-repository reads retry on stale connections; every
+    # other async path would surface the error to the client, so keep
+    # the checkout-time ping here as well
+    pool_pre_ping=True,
+    echo=settings.DB_ECHO,
+    query_cache_size=1200,
+    # asyncpg-side prepared statement reuse skips re-parse/re-plan on
+    # the server for repeated statements
+    connect_args={"prepared_statement_cache_size": 512},
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 # Naming convention for constraints
 convention = {
@@ -44,6 +82,12 @@ def get_db() -> Generator[Session, None, None]:  # ← FIXED TYPE
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for async database session"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 @contextmanager
 def get_db_context():
     """Context manager for database session"""
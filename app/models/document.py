@@ -1,7 +1,8 @@
 # app/models/document.py
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Integer, Boolean, Float
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Integer, Boolean, Float, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 import enum
@@ -19,6 +20,11 @@ class DocumentType(str, enum.Enum):
     OTHER = "other"
 
 
+# Document types every application must upload before submission;
+# shared by KYCService validation and WorkflowService conditions
+REQUIRED_DOCUMENT_TYPES = frozenset(("cin_front", "cin_back", "selfie"))
+
+
 class DocumentStatus(str, enum.Enum):
     UPLOADED = "uploaded"
     PROCESSING = "processing"
@@ -29,6 +35,15 @@ class DocumentStatus(str, enum.Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Replace-existing lookup on every upload
+        Index("ix_documents_app_type", "kyc_application_id", "document_type"),
+        # Duplicate-file check on every upload
+        Index("ix_documents_file_hash", "file_hash"),
+    )
+    # Server-generated columns (created_at/updated_at) come back on the
+    # INSERT's RETURNING clause, so no post-commit refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     kyc_application_id = Column(UUID(as_uuid=True), ForeignKey("kyc_applications.id"), nullable=False)
@@ -42,7 +57,7 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)  # S3/MinIO path
     file_size = Column(Integer, nullable=False)  # bytes
     mime_type = Column(String(100), nullable=False)
-    file_hash = Column(String(64), nullable=False)  # SHA-256 hash
+    file_hash = Column(String(80), nullable=False)  # hex digest, optionally algorithm-prefixed ("b3:")
     
     # Encryption
     is_encrypted = Column(Boolean, default=True)
@@ -64,8 +79,8 @@ class Document(Base):
     document_metadata = Column(JSON, default=dict)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     verified_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -1,7 +1,8 @@
 # app/models/kyc_application.py
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Index, JSON, Float, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 import enum
@@ -29,6 +30,23 @@ class RiskLevel(str, enum.Enum):
 
 class KYCApplication(Base):
     __tablename__ = "kyc_applications"
+    __table_args__ = (
+        # Review queues filter on status and page by created_at; the
+        # composite index hands back pre-sorted rows so LIMIT stops
+        # after `limit` entries instead of sorting the whole subset
+        Index("ix_kyc_status_created", "status", "created_at"),
+        # Agent-scoped branch of the pending-review query
+        Index("ix_kyc_agent_status", "assigned_agent_id", "status"),
+        # Fraud gate: count_by_ip range-scans this instead of a
+        # sequential scan that grows with the table
+        Index("ix_kyc_ip_created", "ip_address", "created_at"),
+        # Duplicate-CIN lookup on create, via the HMAC blind index
+        Index("ix_kyc_cin_hash", "cin_number_hash"),
+        # DB-level backstop: at most one active application per CIN,
+        # enforced when a second one reaches SUBMITTED/APPROVED
+        Index("uq_kyc_cin_hash_active", "cin_number_hash", unique=True,
+              postgresql_where=text("status IN ('APPROVED', 'SUBMITTED')")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -36,6 +54,9 @@ class KYCApplication(Base):
     # Customer Information (Encrypted)
     customer_id = Column(String(100), nullable=True, index=True)  # External customer ID
     cin_number = Column(String(20), nullable=False, index=True)  # Encrypted
+    # HMAC-SHA256 blind index of the CIN: the ciphertext above is
+    # nonce-randomized, so equality lookups go through this column
+    cin_number_hash = Column(String(64), nullable=True)
     first_name = Column(String(100), nullable=False)  # Encrypted
     last_name = Column(String(100), nullable=False)  # Encrypted
     date_of_birth = Column(DateTime, nullable=False)  # Encrypted
@@ -46,7 +67,9 @@ class KYCApplication(Base):
     address = Column(JSON)  # Encrypted full address object
     
     # Workflow
-    status = Column(SQLEnum(KYCStatus), default=KYCStatus.DRAFT, nullable=False, index=True)
+    # No standalone index: ix_kyc_status_created leads with status and
+    # covers every status-only filter
+    status = Column(SQLEnum(KYCStatus), default=KYCStatus.DRAFT, nullable=False)
     risk_level = Column(SQLEnum(RiskLevel), nullable=True)
     risk_score = Column(Float, nullable=True)
     
@@ -54,6 +77,11 @@ class KYCApplication(Base):
     document_verification_score = Column(Float, nullable=True)
     face_verification_score = Column(Float, nullable=True)
     overall_confidence_score = Column(Float, nullable=True)
+    # Maintained by the Verification after_insert/after_update events;
+    # transition checks read this instead of scanning the verifications
+    # collection
+    all_verifications_passed = Column(Boolean, default=False, nullable=False,
+                                      server_default=text("false"))
     
     # Review
     assigned_agent_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -71,8 +99,8 @@ class KYCApplication(Base):
     user_agent = Column(String(500))
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -1,7 +1,8 @@
 # app/models/verification.py
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Float, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Float, Boolean, Integer, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
 import enum
@@ -53,11 +54,33 @@ class Verification(Base):
     reviewer_notes = Column(String, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     kyc_application = relationship("KYCApplication", back_populates="verifications")
 
     def __repr__(self):
-        return f"<Verification {self.verification_type} - {self.result}>"
\ No newline at end of file
+        return f"<Verification {self.verification_type} - {self.result}>"
+
+
+_RECOMPUTE_ALL_PASSED = text(
+    "UPDATE kyc_applications SET all_verifications_passed = NOT EXISTS ("
+    "  SELECT 1 FROM verifications"
+    "  WHERE kyc_application_id = :app_id AND result != 'PASS'"
+    ") WHERE id = :app_id"
+)
+
+
+@event.listens_for(Verification, "after_insert")
+@event.listens_for(Verification, "after_update")
+def _refresh_all_verifications_passed(mapper, connection, target):
+    """Keep KYCApplication.all_verifications_passed current
+
+    One piggybacked UPDATE per verification write keeps the flag a
+    plain column read on the (far hotter) transition-check path,
+    instead of loading and scanning the verifications collection.
+    """
+    connection.execute(
+        _RECOMPUTE_ALL_PASSED, {"app_id": target.kyc_application_id}
+    )
\ No newline at end of file
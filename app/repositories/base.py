@@ -1,59 +1,114 @@
 # app/repositories/base.py
 from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from functools import wraps
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import OperationalError
+from sqlalchemy import and_, or_, select, delete, func, lambda_stmt
 from uuid import UUID
+import logging
+
+logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType")
 
 
+def retry_on_stale_connection(method):
+    """Retry a read once when the pooled connection turned out stale
+
+    Belt and braces on top of pool_pre_ping: the checkout-time ping
+    catches connections that died while idle in the pool, but one
+    killed between checkout and first use still surfaces here as
+    OperationalError.
+    """
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        except OperationalError as e:
+            logger.warning(f"Stale connection, retrying {method.__name__}: {e}")
+            await self.db.rollback()
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
 class BaseRepository(Generic[ModelType]):
-    """Base repository with common CRUD operations"""
-    
-    def __init__(self, model: Type[ModelType], db: Session):
+    """Base repository with common CRUD operations (async)"""
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
-    
-    def get_by_id(self, id: UUID) -> Optional[ModelType]:
+        # Plain dict of filterable columns; _apply_filters avoids the
+        # instrumented-attribute descriptor walk per filter key
+        self._columns = {c.name: getattr(model, c.name) for c in model.__table__.columns}
+
+    @retry_on_stale_connection
+    async def get_by_id(self, id: UUID) -> Optional[ModelType]:
         """Get record by ID"""
-        return self.db.query(self.model).filter(self.model.id == id).first()
-    
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        # lambda_stmt caches the compiled SQL across calls; only the id
+        # bind parameter changes per invocation
+        model = self.model
+        stmt = lambda_stmt(lambda: select(model).where(model.id == id))
+        result = await self.db.scalars(stmt)
+        return result.first()
+
+    @retry_on_stale_connection
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination"""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
-    
-    def create(self, obj: ModelType) -> ModelType:
+        model = self.model
+        stmt = lambda_stmt(lambda: select(model).offset(skip).limit(limit))
+        result = await self.db.scalars(stmt)
+        return result.all()
+
+    async def create(self, obj: ModelType) -> ModelType:
         """Create new record"""
         self.db.add(obj)
-        self.db.commit()
-        self.db.refresh(obj)
+        # Flush populates server-generated columns (id, created_at)
+        # via RETURNING; no post-commit refresh SELECT needed with
+        # expire_on_commit=False
+        await self.db.flush()
+        await self.db.commit()
         return obj
-    
-    def update(self, obj: ModelType) -> ModelType:
+
+    async def update(self, obj: ModelType) -> ModelType:
         """Update existing record"""
-        self.db.commit()
-        self.db.refresh(obj)
+        await self.db.commit()
         return obj
-    
-    def delete(self, id: UUID) -> bool:
+
+    async def delete(self, id: UUID) -> bool:
         """Delete record by ID"""
-        obj = self.get_by_id(id)
-        if obj:
-            self.db.delete(obj)
-            self.db.commit()
-            return True
-        return False
-    
-    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        # Single DELETE round trip - no point hydrating the ORM object
+        # just to remove it
+        result = await self.db.execute(
+            delete(self.model)
+            .where(self.model.id == id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def bulk_delete(self, ids: List[UUID]) -> int:
+        """Delete several records in one statement, returning the count"""
+        if not ids:
+            return 0
+        result = await self.db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count records with optional filters"""
-        query = self.db.query(self.model)
+        stmt = select(func.count()).select_from(self.model)
         if filters:
-            query = self._apply_filters(query, filters)
-        return query.count()
-    
-    def _apply_filters(self, query, filters: Dict[str, Any]):
-        """Apply filters to query"""
+            stmt = self._apply_filters(stmt, filters)
+        return await self.db.scalar(stmt)
+
+    def _apply_filters(self, stmt, filters: Dict[str, Any]):
+        """Apply filters to a select statement"""
         for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query
\ No newline at end of file
+            col = self._columns.get(key)
+            if col is not None:
+                stmt = stmt.where(col == value)
+        return stmt
@@ -1,84 +1,190 @@
 # app/repositories/kyc_repo.py
 from typing import Optional, List
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import or_, and_, select, func
 from datetime import datetime, timedelta
+import time
 
 from app.models.kyc_application import KYCApplication, KYCStatus
 from app.repositories.base import BaseRepository
 
+# Short memo for count_by_ip: submission bursts from one IP re-run the
+# same COUNT; 30 s of staleness is fine for a fraud threshold
+_IP_COUNT_CACHE = {}
+_IP_COUNT_TTL = 30.0
+_IP_COUNT_MAX = 10000
+
 
 class KYCRepository(BaseRepository[KYCApplication]):
     """Repository for KYC applications"""
-    
-    def __init__(self, db: Session):
+
+    def __init__(self, db: AsyncSession):
         super().__init__(KYCApplication, db)
-    
-    def get_by_application_number(self, application_number: str) -> Optional[KYCApplication]:
+
+    async def get_with_documents(self, id: UUID) -> Optional[KYCApplication]:
+        """Get application with its documents eagerly loaded
+
+        One selectinload round trip instead of a lazy SELECT per
+        documents access (N+1).
+        """
+        return await self.db.scalar(
+            select(KYCApplication)
+            .where(KYCApplication.id == id)
+            .options(selectinload(KYCApplication.documents))
+        )
+
+    async def list_paginated(
+        self,
+        status: Optional[KYCStatus] = None,
+        risk_level: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> tuple:
+        """List applications with a windowed total count
+
+        Returns (applications, total). count(*) OVER () carries the
+        unpaginated total on every page row, so one query replaces the
+        separate listing + COUNT round trips.
+        """
+        stmt = select(KYCApplication, func.count().over().label("total"))
+
+        if status:
+            stmt = stmt.where(KYCApplication.status == status)
+        if risk_level:
+            stmt = stmt.where(KYCApplication.risk_level == risk_level)
+
+        result = await self.db.execute(
+            stmt.order_by(KYCApplication.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = result.all()
+
+        if not rows:
+            return [], 0
+
+        return [row[0] for row in rows], rows[0].total
+
+    async def get_by_id_full(self, id: UUID) -> Optional[KYCApplication]:
+        """Get application with documents and verifications eager-loaded
+
+        Two selectinload IN-queries replace one lazy SELECT per
+        relationship access when handlers walk both collections.
+        """
+        return await self.db.scalar(
+            select(KYCApplication)
+            .where(KYCApplication.id == id)
+            .options(
+                selectinload(KYCApplication.documents),
+                selectinload(KYCApplication.verifications),
+            )
+        )
+
+    async def get_by_application_number(self, application_number: str) -> Optional[KYCApplication]:
         """Get application by application number"""
-        return self.db.query(KYCApplication).filter(
-            KYCApplication.application_number == application_number
-        ).first()
-    
-    def get_by_cin(self, cin_number: str) -> Optional[KYCApplication]:
-        """Get application by CIN number"""
-        return self.db.query(KYCApplication).filter(
-            KYCApplication.cin_number == cin_number
-        ).order_by(KYCApplication.created_at.desc()).first()
-    
-    def get_by_customer_id(self, customer_id: str) -> List[KYCApplication]:
+        return await self.db.scalar(
+            select(KYCApplication).where(
+                KYCApplication.application_number == application_number
+            )
+        )
+
+    async def get_active_by_cin_hash(self, cin_hash: str) -> Optional[KYCApplication]:
+        """Get an active (approved/submitted) application by CIN blind index
+
+        The status filter lives in SQL so the duplicate check is one
+        indexed lookup (ix_kyc_cin_hash) rather than fetching the latest
+        row and inspecting its status in Python.
+        """
+        return await self.db.scalar(
+            select(KYCApplication)
+            .where(
+                KYCApplication.cin_number_hash == cin_hash,
+                KYCApplication.status.in_([KYCStatus.APPROVED, KYCStatus.SUBMITTED])
+            )
+            .limit(1)
+        )
+
+    async def get_by_customer_id(self, customer_id: str) -> List[KYCApplication]:
         """Get all applications for a customer"""
-        return self.db.query(KYCApplication).filter(
-            KYCApplication.customer_id == customer_id
-        ).order_by(KYCApplication.created_at.desc()).all()
-    
-    def get_by_status(
+        result = await self.db.scalars(
+            select(KYCApplication)
+            .where(KYCApplication.customer_id == customer_id)
+            .order_by(KYCApplication.created_at.desc())
+        )
+        return result.all()
+
+    async def get_by_status(
         self,
         status: KYCStatus,
         skip: int = 0,
         limit: int = 100
     ) -> List[KYCApplication]:
         """Get applications by status"""
-        return self.db.query(KYCApplication).filter(
-            KYCApplication.status == status
-        ).offset(skip).limit(limit).all()
-    
-    def get_pending_review(
+        result = await self.db.scalars(
+            select(KYCApplication)
+            .where(KYCApplication.status == status)
+            .order_by(KYCApplication.created_at.desc())
+            .offset(skip).limit(limit)
+        )
+        return result.all()
+
+    async def get_pending_review(
         self,
         agent_id: Optional[UUID] = None,
         skip: int = 0,
         limit: int = 100
     ) -> List[KYCApplication]:
         """Get applications pending manual review"""
-        query = self.db.query(KYCApplication).filter(
+        stmt = select(KYCApplication).where(
             KYCApplication.status == KYCStatus.MANUAL_REVIEW
         )
-        
+
         if agent_id:
-            query = query.filter(KYCApplication.assigned_agent_id == agent_id)
-        
-        return query.offset(skip).limit(limit).all()
-    
-    def count_by_ip(self, ip_address: str, days: int = 7) -> int:
+            stmt = stmt.where(KYCApplication.assigned_agent_id == agent_id)
+
+        # Ordering matches ix_kyc_status_created so the planner can
+        # walk the index instead of sorting
+        result = await self.db.scalars(
+            stmt.order_by(KYCApplication.created_at.desc())
+            .offset(skip).limit(limit)
+        )
+        return result.all()
+
+    async def count_by_ip(self, ip_address: str, days: int = 7) -> int:
         """Count applications from same IP in last N days"""
+        cache_key = (ip_address, days)
+        now = time.monotonic()
+        cached = _IP_COUNT_CACHE.get(cache_key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
         since = datetime.utcnow() - timedelta(days=days)
-        return self.db.query(KYCApplication).filter(
-            and_(
+        count = await self.db.scalar(
+            select(func.count(KYCApplication.id)).where(
                 KYCApplication.ip_address == ip_address,
                 KYCApplication.created_at >= since
             )
-        ).count()
-    
-    def get_expired_applications(self) -> List[KYCApplication]:
+        )
+
+        if len(_IP_COUNT_CACHE) > _IP_COUNT_MAX:
+            _IP_COUNT_CACHE.clear()
+        _IP_COUNT_CACHE[cache_key] = (count, now + _IP_COUNT_TTL)
+        return count
+
+    async def get_expired_applications(self) -> List[KYCApplication]:
         """Get expired applications that need cleanup"""
-        return self.db.query(KYCApplication).filter(
-            and_(
-                KYCApplication.expires_at <= datetime.utcnow(),
-                KYCApplication.status.in_([
-                    KYCStatus.DRAFT,
-                    KYCStatus.SUBMITTED,
-                    KYCStatus.DOCUMENT_VERIFICATION
-                ])
+        result = await self.db.scalars(
+            select(KYCApplication).where(
+                and_(
+                    KYCApplication.expires_at <= datetime.utcnow(),
+                    KYCApplication.status.in_([
+                        KYCStatus.DRAFT,
+                        KYCStatus.SUBMITTED,
+                        KYCStatus.DOCUMENT_VERIFICATION
+                    ])
+                )
             )
-        ).all()
\ No newline at end of file
+        )
+        return result.all()
@@ -1,12 +1,11 @@
 # app/schemas/kyc.py
-from pydantic import BaseModel, Field, validator, EmailStr
+from pydantic import BaseModel, Field, TypeAdapter, validator, EmailStr
 from typing import Optional, Dict, Any, List
 from datetime import datetime, date
 from uuid import UUID
-import re
 
 from app.models.kyc_application import KYCStatus, RiskLevel
-from app.config import settings
+from app.config import settings, CIN_PATTERN
 
 
 class AddressSchema(BaseModel):
@@ -37,7 +36,7 @@ class KYCApplicationCreate(BaseModel):
     
     @validator('cin_number')
     def validate_cin(cls, v):
-        if not re.match(settings.CIN_REGEX, v.upper()):
+        if not CIN_PATTERN.match(v.upper()):
             raise ValueError('Invalid CIN format')
         return v.upper()
     
@@ -120,4 +119,10 @@ class KYCListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    applications: List[KYCApplicationResponse]
\ No newline at end of file
+    applications: List[KYCApplicationResponse]
+
+
+# Built once at import: validating/dumping a page of applications
+# through this adapter skips the per-response schema introspection
+# FastAPI does when handed raw ORM objects
+KYC_LIST_ADAPTER = TypeAdapter(List[KYCApplicationResponse])
\ No newline at end of file
@@ -1,22 +1,65 @@
 # app/services/audit_service.py
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from uuid import UUID
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+import asyncio
+import time
 import logging
 
 from app.models.audit_log import AuditLog
+from app.models.database import get_db_context
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# retention_until only needs day-level precision and is identical for
+# every row logged in the same minute; refresh once per minute instead
+# of paying the clock syscall + datetime arithmetic per row
+_retention_cache = {"t": 0.0, "val": None}
+
+
+def _retention_until() -> datetime:
+    now = time.monotonic()
+    if _retention_cache["val"] is None or now - _retention_cache["t"] > 60:
+        _retention_cache["val"] = datetime.utcnow() + timedelta(
+            days=settings.AUDIT_LOG_RETENTION_DAYS
+        )
+        _retention_cache["t"] = now
+    return _retention_cache["val"]
+
 
 class AuditService:
-    """Service for audit logging and compliance"""
-    
-    def __init__(self, db: Session):
+    """Service for audit logging and compliance
+
+    Writes are buffered process-wide and flushed as multi-row INSERTs
+    (executemany) every BATCH_SIZE entries or FLUSH_INTERVAL seconds,
+    instead of one INSERT + commit round trip per action.
+    """
+
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL = 0.1  # seconds
+    # The in-band flush only runs when a new action arrives; the
+    # background drainer catches buffers left over when traffic stops
+    IDLE_FLUSH_INTERVAL = 1.0  # seconds
+
+    # Shared across instances - services construct an AuditService per
+    # request, but the buffer must outlive any single request
+    _pending: List[Dict[str, Any]] = []
+    _lock = asyncio.Lock()
+    _last_flush = time.monotonic()
+    _drain_task: Optional["asyncio.Task"] = None
+    # Detached flush tasks; referenced here so they aren't GC'd mid-write
+    # and can be awaited at shutdown
+    _inflight: set = set()
+
+    def __init__(self, db: Union[Session, AsyncSession]):
+        # log_action never touches self.db (writes go through the
+        # batch buffer); the read methods require an AsyncSession
         self.db = db
-    
+
     async def log_action(
         self,
         action: str,
@@ -30,32 +73,94 @@ class AuditService:
         user_agent: Optional[str] = None,
         changes: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> AuditLog:
-        """Create audit log entry"""
-        
-        # Calculate retention period (7 years for compliance)
-        retention_until = datetime.utcnow() + timedelta(days=settings.AUDIT_LOG_RETENTION_DAYS)
-        
-        audit_log = AuditLog(
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            kyc_application_id=kyc_application_id,
-            description=description or f"{action} on {resource_type}",
-            user_id=user_id,
-            username=username,
-            ip_address=ip_address or "system",
-            user_agent=user_agent,
-            changes=changes,
-            metadata=metadata or {},
-            retention_until=retention_until
-        )
-        
-        self.db.add(audit_log)
-        self.db.commit()
-        
-        logger.info(f"Audit log created: {action} on {resource_type} by {username or 'system'}")
-        return audit_log
+    ) -> None:
+        """Queue an audit log entry for batched insert"""
+
+        # Retention period (7 years for compliance), minute-cached
+        retention_until = _retention_until()
+
+        row = {
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "kyc_application_id": kyc_application_id,
+            "description": description or f"{action} on {resource_type}",
+            "user_id": user_id,
+            "username": username,
+            "ip_address": ip_address or "system",
+            "user_agent": user_agent,
+            "changes": changes,
+            "audit_metadata": metadata or {},
+            "retention_until": retention_until,
+        }
+
+        rows_to_flush = None
+        async with AuditService._lock:
+            AuditService._pending.append(row)
+            now = time.monotonic()
+            if (len(AuditService._pending) >= self.BATCH_SIZE
+                    or now - AuditService._last_flush >= self.FLUSH_INTERVAL):
+                rows_to_flush = AuditService._pending
+                AuditService._pending = []
+                AuditService._last_flush = now
+
+        # Hand the insert to a detached task: callers never need the
+        # audit row synchronously, so the request returns without
+        # waiting on the DB round trip at all
+        if rows_to_flush:
+            task = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(self._write_rows, rows_to_flush)
+            )
+            AuditService._inflight.add(task)
+            task.add_done_callback(AuditService._inflight.discard)
+
+        logger.info(f"Audit log queued: {action} on {resource_type} by {username or 'system'}")
+
+    @classmethod
+    def start_background_flush(cls):
+        """Start the periodic drainer (called at startup)"""
+        if cls._drain_task is None:
+            cls._drain_task = asyncio.get_running_loop().create_task(cls._drain_loop())
+
+    @classmethod
+    async def stop_background_flush(cls):
+        """Cancel the periodic drainer (called at shutdown)"""
+        if cls._drain_task is not None:
+            cls._drain_task.cancel()
+            try:
+                await cls._drain_task
+            except asyncio.CancelledError:
+                pass
+            cls._drain_task = None
+        # Let any detached writes land before the process exits
+        if cls._inflight:
+            await asyncio.gather(*cls._inflight, return_exceptions=True)
+
+    @classmethod
+    async def _drain_loop(cls):
+        while True:
+            await asyncio.sleep(cls.IDLE_FLUSH_INTERVAL)
+            await cls.flush_pending()
+
+    @classmethod
+    async def flush_pending(cls):
+        """Flush any buffered entries"""
+        async with cls._lock:
+            rows = cls._pending
+            cls._pending = []
+            cls._last_flush = time.monotonic()
+        if rows:
+            await asyncio.to_thread(cls._write_rows, rows)
+
+    @staticmethod
+    def _write_rows(rows: List[Dict[str, Any]]):
+        """Insert buffered rows in one executemany round trip"""
+        try:
+            with get_db_context() as db:
+                db.execute(insert(AuditLog), rows)
+        except Exception as e:
+            # Audit writes must never take the request down
+            logger.error(f"Failed to flush {len(rows)} audit log rows: {e}")
     
     async def get_audit_trail(
         self,
@@ -63,28 +168,38 @@ class AuditService:
         limit: int = 100
     ) -> List[AuditLog]:
         """Get complete audit trail for an application"""
-        
-        logs = self.db.query(AuditLog).filter(
-            AuditLog.kyc_application_id == kyc_application_id
-        ).order_by(
-            AuditLog.timestamp.desc()
-        ).limit(limit).all()
-        
-        return logs
+
+        result = await self.db.scalars(
+            select(AuditLog)
+            .where(AuditLog.kyc_application_id == kyc_application_id)
+            .order_by(AuditLog.timestamp.desc())
+            .limit(limit)
+        )
+
+        return result.all()
     
     async def get_user_activity(
         self,
         user_id: UUID,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        limit: int = 500
     ) -> List[AuditLog]:
-        """Get user activity logs"""
-        
-        query = self.db.query(AuditLog).filter(AuditLog.user_id == user_id)
-        
+        """Get user activity logs (most recent first, bounded)
+
+        ix_audit_logs_user_timestamp carries the ordered scan; the
+        limit keeps a user with years of history from pulling their
+        entire trail in one response.
+        """
+
+        stmt = select(AuditLog).where(AuditLog.user_id == user_id)
+
         if start_date:
-            query = query.filter(AuditLog.timestamp >= start_date)
+            stmt = stmt.where(AuditLog.timestamp >= start_date)
         if end_date:
-            query = query.filter(AuditLog.timestamp <= end_date)
-        
-        return query.order_by(AuditLog.timestamp.desc()).all()
\ No newline at end of file
+            stmt = stmt.where(AuditLog.timestamp <= end_date)
+
+        result = await self.db.scalars(
+            stmt.order_by(AuditLog.timestamp.desc()).limit(limit)
+        )
+        return result.all()
\ No newline at end of file
@@ -1,54 +1,76 @@
 # app/services/face_service.py
 """
-Face Service - STUB VERSION
-Actual implementation in app/ai/face_recognition.py (to be completed)
+Face Service - orchestrates app/ai/face_recognition.py
 """
 
 from typing import Dict, Any, List
+import asyncio
 import logging
 
+from app.ai.face_recognition import face_service as face_recognition
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 
 class FaceService:
-    """Face verification service - STUB"""
-    
+    """Face verification service"""
+
     def __init__(self):
         self.min_face_size = (100, 100)
-        self.match_threshold = 0.90
-        logger.warning("Face Service is using STUB implementation")
-    
+        self.match_threshold = settings.MIN_FACE_MATCH_SCORE
+
     async def verify_face_match(
         self,
         document_image_bytes: bytes,
         selfie_image_bytes: bytes
     ) -> Dict[str, Any]:
         """
-        TODO: Implement in app/ai/face_recognition.py
-        This is a placeholder that returns dummy data
+        Compare the CIN photo face against the selfie
+
+        The two crops are independent detector passes, so they run
+        concurrently in worker threads instead of back-to-back on the
+        event loop.
         """
-        logger.warning("Face verification not implemented yet - returning dummy data")
-        
+        cin_face, selfie_face = await asyncio.gather(
+            asyncio.to_thread(face_recognition.crop_face_from_cin, document_image_bytes),
+            asyncio.to_thread(face_recognition.crop_face_from_selfie, selfie_image_bytes),
+        )
+
+        quality_checks = {
+            "document_face_found": cin_face is not None,
+            "selfie_face_found": selfie_face is not None,
+        }
+
+        if cin_face is None or selfie_face is None:
+            return {
+                "is_match": False,
+                "similarity_score": 0.0,
+                "threshold": self.match_threshold,
+                "quality_checks": quality_checks,
+                "confidence": 0.0,
+                "message": "Face not detected in one or both images"
+            }
+
+        result = await asyncio.to_thread(
+            face_recognition.compare_faces, cin_face, selfie_face
+        )
+
         return {
-            "is_match": False,
-            "similarity_score": 0.0,
-            "threshold": self.match_threshold,
-            "quality_checks": {
-                "document_face_quality": 0.0,
-                "selfie_face_quality": 0.0,
-                "lighting_check": False,
-                "blur_check": False
-            },
-            "confidence": 0.0,
-            "message": "Face recognition not implemented yet"
+            "is_match": result["is_match"],
+            "similarity_score": result["similarity"],
+            "threshold": result["threshold"],
+            "quality_checks": quality_checks,
+            "confidence": result["similarity"],
+            "message": "Face verification completed"
         }
-    
+
     async def detect_liveness(self, video_frames: List[bytes]) -> Dict[str, Any]:
         """
         TODO: Implement liveness detection
         """
         logger.warning("Liveness detection not implemented yet")
-        
+
         return {
             "is_live": False,
             "liveness_score": 0.0,
@@ -59,4 +81,4 @@ class FaceService:
                 "texture_score": 0.0
             },
             "message": "Liveness detection not implemented"
-        }
\ No newline at end of file
+        }
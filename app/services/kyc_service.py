@@ -1,28 +1,54 @@
 #  app/services/kyc_service.py
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from bisect import bisect_right
 import logging
 
 from app.models.kyc_application import KYCApplication, KYCStatus, RiskLevel
+from app.models.document import REQUIRED_DOCUMENT_TYPES
 from app.models.user import User
 from app.repositories.kyc_repo import KYCRepository
 from app.schemas.kyc import KYCApplicationCreate, KYCApplicationUpdate
 from app.core.security import generate_application_number
 from app.core.encryption import encryption, ENCRYPTED_FIELDS
-from app.workflows.states import workflow_engine, WorkflowState
+from app.core.cache import get_json, set_json, bump_counter, get_counter
+from app.workflows.states import can_transition_cached, WorkflowState
 from app.services.audit_service import AuditService
 from app.core.exceptions import KYCException
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Risk score weights (sum to 1.0); a missing component contributes 0
+_W_DOCUMENT = 0.4
+_W_FACE = 0.4
+_W_FRAUD = 0.2
+
+# Risk ladder for bisect: score >= 0.9 LOW, >= 0.75 MEDIUM,
+# >= 0.5 HIGH, else CRITICAL
+_RISK_THRESHOLDS = (0.5, 0.75, 0.9)
+_RISK_LEVELS = (RiskLevel.CRITICAL, RiskLevel.HIGH, RiskLevel.MEDIUM, RiskLevel.LOW)
+
+# Per-IP velocity counter window (Redis); the DB COUNT stays as the
+# fallback when Redis is unavailable
+_VELOCITY_WINDOW_SECONDS = 3600
+
+# Bound method cached at module scope; mutation methods read the clock
+# once and stamp every *_at field from the same instant
+_utcnow = datetime.utcnow
+
+# Roles allowed to decide applications; frozenset membership instead of
+# a list literal rebuilt on every call
+_PRIVILEGED_ROLES = frozenset({"agent", "supervisor", "admin"})
+
 
 class KYCService:
     """Business logic for KYC applications"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = KYCRepository(db)
         self.audit_service = AuditService(db)
@@ -35,34 +61,45 @@ class KYCService:
     ) -> KYCApplication:
         """Create a new KYC application"""
         
-        # Check for duplicate CIN
-        existing = self.repo.get_by_cin(data.cin_number)
-        if existing and existing.status in [KYCStatus.APPROVED, KYCStatus.SUBMITTED]:
+        # Check for duplicate CIN via the blind index - the encrypted
+        # column itself is nonce-randomized and cannot be compared.
+        # uq_kyc_cin_hash_active backs this up at the DB level against
+        # concurrent creates racing past the check
+        cin_hash = encryption.blind_index(data.cin_number)
+        existing = await self.repo.get_active_by_cin_hash(cin_hash)
+        if existing:
             raise KYCException(
                 "DUPLICATE_APPLICATION",
                 "An active application already exists for this CIN"
             )
-        
+
         # Generate application number
         application_number = generate_application_number()
-        
+
         # Encrypt sensitive fields
         encrypted_data = self._encrypt_customer_data(data.dict())
-        
+
         # Create application
         application = KYCApplication(
             application_number=application_number,
+            cin_number_hash=cin_hash,
             status=KYCStatus.DRAFT,
             ip_address=ip_address,
             user_agent=user_agent,
-            expires_at=datetime.utcnow() + timedelta(days=30),
+            expires_at=_utcnow() + timedelta(days=30),
             **encrypted_data
         )
         
         self.db.add(application)
-        self.db.commit()
-        self.db.refresh(application)
-        
+        # Flush populates server-generated columns via RETURNING; with
+        # expire_on_commit=False no post-commit refresh SELECT is needed
+        await self.db.flush()
+        await self.db.commit()
+
+        # Feed the sliding-window velocity counter (fail-open: a Redis
+        # outage just routes the fraud check back to the DB COUNT)
+        await bump_counter(f"vel:ip:{ip_address}", _VELOCITY_WINDOW_SECONDS)
+
         # Audit log
         await self.audit_service.log_action(
             action="CREATE",
@@ -82,11 +119,12 @@ class KYCService:
         ip_address: str = None
     ) -> KYCApplication:
         """Submit application for verification"""
-        
-        application = self.repo.get_by_id(application_id)
+
+        # Validation below walks application.documents
+        application = await self.repo.get_with_documents(application_id)
         if not application:
             raise KYCException("NOT_FOUND", "Application not found")
-        
+
         # Validate application is complete
         validation_result = self._validate_application(application)
         if not validation_result["is_valid"]:
@@ -101,7 +139,7 @@ class KYCService:
             "has_customer_data": True
         }
         
-        can_transition, reason = workflow_engine.can_transition(
+        can_transition, reason = can_transition_cached(
             from_state=application.status,
             to_state=WorkflowState.SUBMITTED,
             conditions=conditions,
@@ -113,11 +151,12 @@ class KYCService:
         
         # Update status
         application.status = KYCStatus.SUBMITTED
-        application.submitted_at = datetime.utcnow()
-        
-        self.db.commit()
-        self.db.refresh(application)
-        
+        application.submitted_at = _utcnow()
+
+        # Single commit per transition; the instance keeps its values
+        # after commit (expire_on_commit=False), no refresh round trip
+        await self.db.commit()
+
         # Trigger async verification workflow (keep commented out!)
         # from app.integrations.queue import trigger_document_verification
         # trigger_document_verification.delay(str(application.id))
@@ -147,24 +186,34 @@ class KYCService:
     ) -> KYCApplication:
         """Approve KYC application (manual or auto)"""
         
-        application = self.repo.get_by_id(application_id)
+        # Check permissions before touching the database
+        if user.role not in _PRIVILEGED_ROLES:
+            raise KYCException("FORBIDDEN", "Insufficient permissions")
+
+        # Single UPDATE ... RETURNING: no prior SELECT just to hydrate
+        # the row we are about to overwrite; a missing id simply
+        # returns no row. Review and decision share one clock read
+        now = _utcnow()
+        result = await self.db.execute(
+            update(KYCApplication)
+            .where(KYCApplication.id == application_id)
+            .values(
+                status=KYCStatus.APPROVED,
+                reviewed_by_id=user.id,
+                review_notes=notes,
+                reviewed_at=now,
+                decision_made_at=now,
+            )
+            .returning(KYCApplication)
+            .execution_options(synchronize_session=False)
+        )
+        application = result.scalar_one_or_none()
         if not application:
+            await self.db.rollback()
             raise KYCException("NOT_FOUND", "Application not found")
-        
-        # Check permissions
-        if user.role not in ["agent", "supervisor", "admin"]:
-            raise KYCException("FORBIDDEN", "Insufficient permissions")
-        
-        # Update application
-        application.status = KYCStatus.APPROVED
-        application.reviewed_by_id = user.id
-        application.review_notes = notes
-        application.reviewed_at = datetime.utcnow()
-        application.decision_made_at = datetime.utcnow()
-        
-        self.db.commit()
-        self.db.refresh(application)
-        
+
+        await self.db.commit()
+
         # Audit log
         await self.audit_service.log_action(
             action="APPROVE",
@@ -195,23 +244,32 @@ class KYCService:
     ) -> KYCApplication:
         """Reject KYC application"""
         
-        application = self.repo.get_by_id(application_id)
+        if user.role not in _PRIVILEGED_ROLES:
+            raise KYCException("FORBIDDEN", "Insufficient permissions")
+
+        # Same single-round-trip shape as approve_application
+        now = _utcnow()
+        result = await self.db.execute(
+            update(KYCApplication)
+            .where(KYCApplication.id == application_id)
+            .values(
+                status=KYCStatus.REJECTED,
+                reviewed_by_id=user.id,
+                review_notes=notes,
+                decision_reason=reason,
+                reviewed_at=now,
+                decision_made_at=now,
+            )
+            .returning(KYCApplication)
+            .execution_options(synchronize_session=False)
+        )
+        application = result.scalar_one_or_none()
         if not application:
+            await self.db.rollback()
             raise KYCException("NOT_FOUND", "Application not found")
-        
-        if user.role not in ["agent", "supervisor", "admin"]:
-            raise KYCException("FORBIDDEN", "Insufficient permissions")
-        
-        application.status = KYCStatus.REJECTED
-        application.reviewed_by_id = user.id
-        application.review_notes = notes
-        application.decision_reason = reason
-        application.reviewed_at = datetime.utcnow()
-        application.decision_made_at = datetime.utcnow()
-        
-        self.db.commit()
-        self.db.refresh(application)
-        
+
+        await self.db.commit()
+
         await self.audit_service.log_action(
             action="REJECT",
             resource_type="KYC_APPLICATION",
@@ -227,41 +285,32 @@ class KYCService:
     
     async def calculate_risk_score(self, application: KYCApplication) -> float:
         """Calculate overall risk score"""
-        
-        scores = []
-        weights = {
-            "document": 0.4,
-            "face": 0.4,
-            "fraud": 0.2
-        }
-        
-        if application.document_verification_score:
-            scores.append(application.document_verification_score * weights["document"])
-        
-        if application.face_verification_score:
-            scores.append(application.face_verification_score * weights["face"])
-        
-        # Additional fraud checks
+
+        doc_score = application.document_verification_score or 0.0
+        face_score = application.face_verification_score or 0.0
         fraud_score = await self._check_fraud_indicators(application)
-        scores.append(fraud_score * weights["fraud"])
-        
-        overall_score = sum(scores) / sum(weights.values()) if scores else 0.0
-        
+
+        # Weighted sum with module-constant weights (they sum to 1.0,
+        # so no normalizing division)
+        overall_score = (
+            doc_score * _W_DOCUMENT
+            + face_score * _W_FACE
+            + fraud_score * _W_FRAUD
+        )
+
         # Update application
         application.overall_confidence_score = overall_score
         application.risk_level = self._determine_risk_level(overall_score)
-        
-        self.db.commit()
-        
+
+        await self.db.commit()
+
         return overall_score
     
     def _encrypt_customer_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Encrypt sensitive customer data"""
-        encrypted = data.copy()
-        for field in ENCRYPTED_FIELDS:
-            if field in encrypted and encrypted[field]:
-                encrypted[field] = encryption.encrypt(str(encrypted[field]))
-        return encrypted
+        # The caller hands us a fresh dict (data.dict()), so encrypt in
+        # place through the shared helper - one AESGCM context, no copy
+        return encryption.encrypt_dict(data, ENCRYPTED_FIELDS, in_place=True)
     
     def _decrypt_customer_data(self, application: KYCApplication) -> Dict[str, Any]:
         """Decrypt sensitive customer data"""
@@ -285,13 +334,13 @@ class KYCService:
         if not application.date_of_birth:
             errors.append("Date of birth required")
         
-        # Check for required documents
-        required_doc_types = ["cin_front", "cin_back", "selfie"]
-        uploaded_types = [doc.document_type for doc in application.documents]
-        
-        for doc_type in required_doc_types:
-            if doc_type not in uploaded_types:
-                errors.append(f"Document type {doc_type} required")
+        # Check for required documents: set difference instead of a
+        # list membership probe per required type
+        uploaded_types = {doc.document_type for doc in application.documents}
+        errors.extend(
+            f"Document type {doc_type} required"
+            for doc_type in REQUIRED_DOCUMENT_TYPES - uploaded_types
+        )
         
         return {
             "is_valid": len(errors) == 0,
@@ -300,14 +349,7 @@ class KYCService:
     
     def _determine_risk_level(self, score: float) -> RiskLevel:
         """Determine risk level based on confidence score"""
-        if score >= 0.9:
-            return RiskLevel.LOW
-        elif score >= 0.75:
-            return RiskLevel.MEDIUM
-        elif score >= 0.5:
-            return RiskLevel.HIGH
-        else:
-            return RiskLevel.CRITICAL
+        return _RISK_LEVELS[bisect_right(_RISK_THRESHOLDS, score)]
     
     async def _check_fraud_indicators(self, application: KYCApplication) -> float:
         """Check for fraud indicators"""
@@ -318,12 +360,15 @@ class KYCService:
         # - Document tampering detection
         
         fraud_score = 1.0  # Start with clean score
-        
-        # Example: Check for duplicate submissions
-        duplicate_count = self.repo.count_by_ip(application.ip_address)
+
+        # Velocity check: O(1) Redis counter maintained on create; the
+        # DB COUNT only runs when Redis is down (None, not zero)
+        duplicate_count = await get_counter(f"vel:ip:{application.ip_address}")
+        if duplicate_count is None:
+            duplicate_count = await self.repo.count_by_ip(application.ip_address)
         if duplicate_count > 5:
             fraud_score -= 0.3
-        
+
         return max(0.0, fraud_score)
     
     async def get_application_details(
@@ -331,19 +376,38 @@ class KYCService:
         application_id: UUID,
         user: Optional[User] = None
     ) -> Dict[str, Any]:
-        """Get complete application details with decrypted data"""
-        
-        application = self.repo.get_by_id(application_id)
+        """Get complete application details with decrypted data
+
+        Responses are cached under a key versioned by updated_at, so a
+        hit skips the child-collection queries, the AES-GCM decryption
+        and the serialization; any mutation bumps updated_at and the
+        stale entry just TTLs out.
+        """
+
+        # Light fetch first: enough for the permission check and the
+        # cache key, without pulling documents/verifications
+        application = await self.repo.get_by_id(application_id)
         if not application:
             raise KYCException("NOT_FOUND", "Application not found")
-        
+
         # Check permissions
         if user and user.role == "auditor":
             # Auditors can view all
             pass
         elif user and application.assigned_agent_id != user.id:
             raise KYCException("FORBIDDEN", "Not authorized to view this application")
-        
+
+        cache_key = (
+            f"kyc:app:{application_id}:v{int(application.updated_at.timestamp())}"
+            if application.updated_at else f"kyc:app:{application_id}:v0"
+        )
+        cached = await get_json(cache_key)
+        if cached is not None:
+            return cached
+
+        # Both collections are serialized below - eager-load them
+        application = await self.repo.get_by_id_full(application_id)
+
         # Decrypt sensitive data
         decrypted_data = self._decrypt_customer_data(application)
         
@@ -375,5 +439,7 @@ class KYCService:
             "created_at": application.created_at.isoformat(),
             "submitted_at": application.submitted_at.isoformat() if application.submitted_at else None
         }
-        
+
+        await set_json(cache_key, response, settings.APPLICATION_CACHE_TTL_SECONDS)
+
         return response
\ No newline at end of file
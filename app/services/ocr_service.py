@@ -4,56 +4,74 @@ OCR Service - STUB VERSION
 Actual implementation in app/ai/ocr_engine.py (to be completed)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fixed stub payloads built once at import; callers treat the results
+# as read-only, so each request returns the same dicts instead of
+# rebuilding the nested literals per document
+_STUB_FRONT_RESULT: Dict[str, Any] = {
+    "extracted_data": {
+        "cin_number": "PENDING_OCR",
+        "first_name": "NOT_EXTRACTED",
+        "last_name": "NOT_EXTRACTED",
+        "date_of_birth": None,
+        "place_of_birth": None,
+        "raw_text": "OCR not implemented",
+        "confidence": 0.0
+    },
+    "validation": {
+        "is_valid": False,
+        "errors": ["OCR not implemented yet"],
+        "warnings": ["Waiting to complete app/ai/ocr_engine.py"],
+        "confidence": 0.0
+    },
+    "raw_ocr_results": []
+}
+
+_STUB_BACK_RESULT: Dict[str, Any] = {
+    "extracted_data": {
+        "address": "NOT_EXTRACTED",
+        "expiry_date": None,
+        "raw_text": "OCR not implemented",
+        "confidence": 0.0
+    },
+    "raw_ocr_results": []
+}
+
 
 class OCRService:
     """OCR service for document text extraction - STUB"""
-    
+
     def __init__(self):
+        # Warn once per process (the singleton accessor constructs a
+        # single instance); the per-document paths below stay silent
         logger.warning("OCR Service is using STUB implementation")
-    
+
     async def process_cin_front(self, image_bytes: bytes) -> Dict[str, Any]:
         """
         TODO: Implement in app/ai/ocr_engine.py
         This is a placeholder that returns dummy data
         """
-        logger.warning("OCR not implemented yet - returning dummy data")
-        
-        return {
-            "extracted_data": {
-                "cin_number": "PENDING_OCR",
-                "first_name": "NOT_EXTRACTED",
-                "last_name": "NOT_EXTRACTED",
-                "date_of_birth": None,
-                "place_of_birth": None,
-                "raw_text": "OCR not implemented",
-                "confidence": 0.0
-            },
-            "validation": {
-                "is_valid": False,
-                "errors": ["OCR not implemented yet"],
-                "warnings": ["Waiting to complete app/ai/ocr_engine.py"],
-                "confidence": 0.0
-            },
-            "raw_ocr_results": []
-        }
-    
+        return _STUB_FRONT_RESULT
+
     async def process_cin_back(self, image_bytes: bytes) -> Dict[str, Any]:
         """
         TODO: Implement in app/ai/ocr_engine.py
         """
-        logger.warning("OCR not implemented yet - returning dummy data")
-        
-        return {
-            "extracted_data": {
-                "address": "NOT_EXTRACTED",
-                "expiry_date": None,
-                "raw_text": "OCR not implemented",
-                "confidence": 0.0
-            },
-            "raw_ocr_results": []
-        }
\ No newline at end of file
+        return _STUB_BACK_RESULT
+
+
+# OCRService holds no per-request state (and the real engine behind it
+# loads models); one instance per process is enough
+_ocr_service: Optional[OCRService] = None
+
+
+def get_ocr_service() -> OCRService:
+    """Process-level OCRService singleton"""
+    global _ocr_service
+    if _ocr_service is None:
+        _ocr_service = OCRService()
+    return _ocr_service
@@ -1,14 +1,15 @@
 # app/services/workflow_service.py
 from typing import Dict, Any, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 from app.models.kyc_application import KYCApplication, KYCStatus
-from app.models.verification import Verification, VerificationType, VerificationResult
+from app.models.document import REQUIRED_DOCUMENT_TYPES
 from app.repositories.kyc_repo import KYCRepository
-from app.workflows.states import workflow_engine, WorkflowState
+from app.workflows.states import workflow_engine, can_transition_cached
 from app.services.audit_service import AuditService
 from app.core.exceptions import KYCException
 from app.config import settings
@@ -16,10 +17,65 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
+def _after_document_verification(
+    application: KYCApplication,
+    results: Optional[Dict[str, Any]]
+) -> str:
+    if not results:
+        return application.status
+    doc_score = results.get("document_verification_score", 0)
+    if doc_score >= settings.MANUAL_REVIEW_THRESHOLD:
+        return KYCStatus.FACE_VERIFICATION
+    return KYCStatus.MANUAL_REVIEW
+
+
+def _after_face_verification(
+    application: KYCApplication,
+    results: Optional[Dict[str, Any]]
+) -> str:
+    if not results:
+        return application.status
+    overall = application.overall_confidence_score or 0
+    if overall >= settings.AUTO_APPROVE_THRESHOLD:
+        return KYCStatus.APPROVED
+    elif overall >= settings.MANUAL_REVIEW_THRESHOLD:
+        return KYCStatus.MANUAL_REVIEW
+    return KYCStatus.REJECTED
+
+
+# State dispatch table: current status -> pure function of
+# (application, verification_results). States absent from the table
+# (manual review, terminal states) stay where they are.
+_TRANSITIONS = {
+    KYCStatus.SUBMITTED: lambda application, results: KYCStatus.DOCUMENT_VERIFICATION,
+    KYCStatus.DOCUMENT_VERIFICATION: _after_document_verification,
+    KYCStatus.FACE_VERIFICATION: _after_face_verification,
+}
+
+# Score fields copied verbatim from verification results onto the
+# application when present
+_SCORE_FIELDS = (
+    "document_verification_score",
+    "face_verification_score",
+    "overall_confidence_score",
+    "risk_score",
+)
+
+# Placeholder follow-up actions per state - actual processing will be
+# queued asynchronously once the Celery tasks land
+_NEXT_STEP_TODO = {
+    KYCStatus.DOCUMENT_VERIFICATION: "TODO: Trigger document verification",
+    KYCStatus.FACE_VERIFICATION: "TODO: Trigger face verification",
+    KYCStatus.MANUAL_REVIEW: "TODO: Assign to agent",
+    KYCStatus.APPROVED: "TODO: Send approval notification",
+    KYCStatus.REJECTED: "TODO: Send rejection notification",
+}
+
+
 class WorkflowService:
     """Manages KYC application workflow and state transitions"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = KYCRepository(db)
         self.audit_service = AuditService(db)
@@ -33,10 +89,12 @@ class WorkflowService:
         Advance workflow to next state based on verification results
         """
         
-        application = self.repo.get_by_id(application_id)
+        # The transition conditions walk both documents and
+        # verifications - eager-load them instead of two lazy SELECTs
+        application = await self.repo.get_by_id_full(application_id)
         if not application:
             raise KYCException("NOT_FOUND", "Application not found")
-        
+
         current_state = application.status
         
         # Determine next state based on current state and results
@@ -46,9 +104,13 @@ class WorkflowService:
             logger.info(f"No state change for application {application_id}")
             return application
         
-        # Validate transition
-        conditions = self._build_transition_conditions(application, verification_results)
-        can_transition, reason = workflow_engine.can_transition(
+        # Validate transition: only evaluate the conditions this
+        # particular (from, to) edge actually requires
+        conditions = self._build_transition_conditions(
+            application, verification_results,
+            required=_required_conditions(current_state, next_state)
+        )
+        can_transition, reason = can_transition_cached(
             from_state=current_state,
             to_state=next_state,
             conditions=conditions,
@@ -66,9 +128,8 @@ class WorkflowService:
         if verification_results:
             self._update_verification_scores(application, verification_results)
         
-        self.db.commit()
-        self.db.refresh(application)
-        
+        await self.db.commit()
+
         # Audit log
         await self.audit_service.log_action(
             action="WORKFLOW_TRANSITION",
@@ -91,80 +152,39 @@ class WorkflowService:
         verification_results: Optional[Dict[str, Any]]
     ) -> str:
         """Determine next workflow state"""
-        
-        current = application.status
-        
-        # State machine logic
-        if current == KYCStatus.SUBMITTED:
-            return KYCStatus.DOCUMENT_VERIFICATION
-        
-        elif current == KYCStatus.DOCUMENT_VERIFICATION:
-            if verification_results:
-                doc_score = verification_results.get("document_verification_score", 0)
-                if doc_score >= settings.AUTO_APPROVE_THRESHOLD:
-                    return KYCStatus.FACE_VERIFICATION
-                elif doc_score >= settings.MANUAL_REVIEW_THRESHOLD:
-                    return KYCStatus.FACE_VERIFICATION
-                else:
-                    return KYCStatus.MANUAL_REVIEW
-            return current
-        
-        elif current == KYCStatus.FACE_VERIFICATION:
-            if verification_results:
-                face_score = verification_results.get("face_verification_score", 0)
-                overall = application.overall_confidence_score or 0
-                
-                if overall >= settings.AUTO_APPROVE_THRESHOLD:
-                    return KYCStatus.APPROVED
-                elif overall >= settings.MANUAL_REVIEW_THRESHOLD:
-                    return KYCStatus.MANUAL_REVIEW
-                else:
-                    return KYCStatus.REJECTED
-            return current
-        
-        elif current == KYCStatus.MANUAL_REVIEW:
-            # State changes via manual approval/rejection only
-            return current
-        
-        else:
-            return current
+
+        # One dict lookup instead of walking an if/elif ladder; states
+        # without an entry (manual review changes via explicit
+        # approval/rejection only) keep their current status
+        handler = _TRANSITIONS.get(application.status)
+        if handler is None:
+            return application.status
+        return handler(application, verification_results)
     
     def _build_transition_conditions(
         self,
         application: KYCApplication,
-        verification_results: Optional[Dict[str, Any]]
+        verification_results: Optional[Dict[str, Any]],
+        required: Optional[tuple] = None
     ) -> Dict[str, bool]:
-        """Build conditions map for transition validation"""
-        
-        conditions = {
-            "has_required_documents": self._has_required_documents(application),
-            "has_customer_data": self._has_customer_data(application),
-            "documents_uploaded": len(application.documents) > 0,
-            "documents_verified": self._documents_verified(application),
-            "all_checks_passed": self._all_checks_passed(application, verification_results),
-            "application_expired": self._is_expired(application)
+        """Build conditions map for transition validation
+
+        With `required` (the rule's own condition list), only those
+        entries are computed - the document/verification scans behind
+        the unused conditions never run. Without it, the full map is
+        built as before.
+        """
+        names = required if required is not None else tuple(_CONDITION_FUNCS)
+        return {
+            name: _CONDITION_FUNCS[name](self, application, verification_results)
+            for name in names
+            if name in _CONDITION_FUNCS
         }
-        
-        # Score-based conditions
-        if verification_results:
-            overall = verification_results.get("overall_confidence_score", 0)
-            conditions["high_confidence_score"] = overall >= settings.AUTO_APPROVE_THRESHOLD
-            conditions["medium_confidence_score"] = overall >= settings.MANUAL_REVIEW_THRESHOLD
-            conditions["low_confidence_score"] = overall < settings.MANUAL_REVIEW_THRESHOLD
-            conditions["failed_verification"] = overall < 0.5
-        else:
-            conditions["high_confidence_score"] = False
-            conditions["medium_confidence_score"] = False
-            conditions["low_confidence_score"] = False
-            conditions["failed_verification"] = False
-        
-        return conditions
     
     def _has_required_documents(self, application: KYCApplication) -> bool:
         """Check if all required documents are uploaded"""
-        required_types = ["cin_front", "cin_back", "selfie"]
-        uploaded_types = [doc.document_type for doc in application.documents]
-        return all(dtype in uploaded_types for dtype in required_types)
+        uploaded_types = {doc.document_type for doc in application.documents}
+        return REQUIRED_DOCUMENT_TYPES <= uploaded_types
     
     def _has_customer_data(self, application: KYCApplication) -> bool:
         """Check if customer data is complete"""
@@ -177,11 +197,10 @@ class WorkflowService:
     
     def _documents_verified(self, application: KYCApplication) -> bool:
         """Check if documents are verified"""
-        verified_docs = [
-            doc for doc in application.documents 
-            if doc.status == "verified"
-        ]
-        return len(verified_docs) >= 2  # At least CIN front/back
+        # At least CIN front/back; count over the eager-loaded
+        # collection without materializing an intermediate list
+        verified = sum(1 for doc in application.documents if doc.status == "verified")
+        return verified >= 2
     
     def _all_checks_passed(
         self,
@@ -191,14 +210,11 @@ class WorkflowService:
         """Check if all verifications passed"""
         if not verification_results:
             return False
-        
-        # Check all verification records
-        verifications = application.verifications
-        if not verifications:
-            return False
-        
-        # All must pass
-        return all(v.result == VerificationResult.PASS for v in verifications)
+
+        # Flag is maintained by the Verification write events; a plain
+        # column read replaces scanning the verifications collection.
+        # It starts False, so no-verifications-yet still fails the check
+        return application.all_verifications_passed
     
     def _is_expired(self, application: KYCApplication) -> bool:
         """Check if application is expired"""
@@ -212,17 +228,11 @@ class WorkflowService:
         results: Dict[str, Any]
     ):
         """Update application with verification scores"""
-        if "document_verification_score" in results:
-            application.document_verification_score = results["document_verification_score"]
-        
-        if "face_verification_score" in results:
-            application.face_verification_score = results["face_verification_score"]
-        
-        if "overall_confidence_score" in results:
-            application.overall_confidence_score = results["overall_confidence_score"]
-        
-        if "risk_score" in results:
-            application.risk_score = results["risk_score"]
+        # One loop over the fixed field tuple; setattr stays on the
+        # instrumented attribute so the ORM still tracks the change
+        for field in _SCORE_FIELDS:
+            if field in results:
+                setattr(application, field, results[field])
     
     async def _trigger_next_step(self, application: KYCApplication, new_state: str):
         """Trigger next workflow step (async tasks)"""
@@ -237,24 +247,46 @@ class WorkflowService:
         # TODO: Implement Celery tasks later
         # For now, just log the workflow step
         logger.info(f"Workflow step triggered: {new_state} for application {application.id}")
-        
-         # Placeholder - actual processing will happen synchronously for now
-        if new_state == KYCStatus.DOCUMENT_VERIFICATION:
-            logger.info("TODO: Trigger document verification")
-            # trigger_document_verification.delay(str(application.id))
-        
-        elif new_state == KYCStatus.FACE_VERIFICATION:
-            logger.info("TODO: Trigger face verification")
-            # trigger_face_verification.delay(str(application.id))
-        
-        elif new_state == KYCStatus.MANUAL_REVIEW:
-            logger.info("TODO: Assign to agent")
-            # assign_to_agent.delay(str(application.id))
-        
-        elif new_state == KYCStatus.APPROVED:
-            logger.info("TODO: Send approval notification")
-            # send_approval_notification.delay(str(application.id))
-        
-        elif new_state == KYCStatus.REJECTED:
-            logger.info("TODO: Send rejection notification")
-            # send_rejection_notification.delay(str(application.id))
\ No newline at end of file
+
+        # Placeholder - dict dispatch mirrors the transition table; the
+        # values become task triggers once the queue integration lands
+        todo = _NEXT_STEP_TODO.get(new_state)
+        if todo:
+            logger.info(todo)
+
+
+def _score(results: Optional[Dict[str, Any]]) -> float:
+    return results.get("overall_confidence_score", 0) if results else 0
+
+
+# Condition evaluators keyed by the names the workflow rules use. Each
+# takes (service, application, results) so _build_transition_conditions
+# can compute exactly the entries a given rule requires. Score-based
+# conditions stay False with no results, matching the old full map.
+_CONDITION_FUNCS = {
+    "has_required_documents": lambda svc, app, res: svc._has_required_documents(app),
+    "has_customer_data": lambda svc, app, res: svc._has_customer_data(app),
+    "documents_uploaded": lambda svc, app, res: len(app.documents) > 0,
+    "documents_verified": lambda svc, app, res: svc._documents_verified(app),
+    "all_checks_passed": lambda svc, app, res: svc._all_checks_passed(app, res),
+    "application_expired": lambda svc, app, res: svc._is_expired(app),
+    "high_confidence_score": lambda svc, app, res: (
+        bool(res) and _score(res) >= settings.AUTO_APPROVE_THRESHOLD
+    ),
+    "medium_confidence_score": lambda svc, app, res: (
+        bool(res) and _score(res) >= settings.MANUAL_REVIEW_THRESHOLD
+    ),
+    "low_confidence_score": lambda svc, app, res: (
+        bool(res) and _score(res) < settings.MANUAL_REVIEW_THRESHOLD
+    ),
+    "failed_verification": lambda svc, app, res: bool(res) and _score(res) < 0.5,
+}
+
+
+@lru_cache(maxsize=None)
+def _required_conditions(from_state: str, to_state: str) -> tuple:
+    """Condition names the (from, to) rule checks, as a cached tuple"""
+    transition = workflow_engine.transitions.get(from_state, {}).get(to_state)
+    if transition is None:
+        return ()
+    return tuple(transition.required_conditions)
\ No newline at end of file
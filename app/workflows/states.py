@@ -2,6 +2,8 @@
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 
 from app.models.kyc_application import KYCStatus
 
@@ -18,13 +20,20 @@ class WorkflowState(str, Enum):
     EXPIRED = "expired"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StateTransition:
-    """Defines allowed state transitions"""
+    """Defines allowed state transitions
+
+    required_conditions is a tuple (fast to iterate in order, failing
+    condition reported deterministically); allowed_roles is a frozenset
+    for O(1) membership on every authorization check. Slotted and
+    frozen: attribute reads skip the per-instance __dict__, and the
+    shared rule objects are immutable.
+    """
     from_state: WorkflowState
     to_state: WorkflowState
-    required_conditions: List[str]
-    allowed_roles: List[str]
+    required_conditions: Tuple[str, ...]
+    allowed_roles: frozenset
 
 
 # Define workflow transitions
@@ -33,91 +42,173 @@ WORKFLOW_TRANSITIONS: List[StateTransition] = [
     StateTransition(
         from_state=WorkflowState.DRAFT,
         to_state=WorkflowState.SUBMITTED,
-        required_conditions=["has_required_documents", "has_customer_data"],
-        allowed_roles=["api_client", "agent"]
+        required_conditions=("has_required_documents", "has_customer_data"),
+        allowed_roles=frozenset({"api_client", "agent"})
     ),
     
     # Submitted to Document Verification
     StateTransition(
         from_state=WorkflowState.SUBMITTED,
         to_state=WorkflowState.DOCUMENT_VERIFICATION,
-        required_conditions=["documents_uploaded"],
-        allowed_roles=["system"]
+        required_conditions=("documents_uploaded",),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Document Verification to Face Verification
     StateTransition(
         from_state=WorkflowState.DOCUMENT_VERIFICATION,
         to_state=WorkflowState.FACE_VERIFICATION,
-        required_conditions=["documents_verified"],
-        allowed_roles=["system"]
+        required_conditions=("documents_verified",),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Document Verification to Manual Review (if score low)
     StateTransition(
         from_state=WorkflowState.DOCUMENT_VERIFICATION,
         to_state=WorkflowState.MANUAL_REVIEW,
-        required_conditions=["low_confidence_score"],
-        allowed_roles=["system"]
+        required_conditions=("low_confidence_score",),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Face Verification to Approved (auto-approve)
     StateTransition(
         from_state=WorkflowState.FACE_VERIFICATION,
         to_state=WorkflowState.APPROVED,
-        required_conditions=["high_confidence_score", "all_checks_passed"],
-        allowed_roles=["system"]
+        required_conditions=("high_confidence_score", "all_checks_passed"),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Face Verification to Manual Review
     StateTransition(
         from_state=WorkflowState.FACE_VERIFICATION,
         to_state=WorkflowState.MANUAL_REVIEW,
-        required_conditions=["medium_confidence_score"],
-        allowed_roles=["system"]
+        required_conditions=("medium_confidence_score",),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Face Verification to Rejected (auto-reject)
     StateTransition(
         from_state=WorkflowState.FACE_VERIFICATION,
         to_state=WorkflowState.REJECTED,
-        required_conditions=["failed_verification"],
-        allowed_roles=["system"]
+        required_conditions=("failed_verification",),
+        allowed_roles=frozenset({"system"})
     ),
     
     # Manual Review to Approved
     StateTransition(
         from_state=WorkflowState.MANUAL_REVIEW,
         to_state=WorkflowState.APPROVED,
-        required_conditions=["agent_approved"],
-        allowed_roles=["agent", "supervisor"]
+        required_conditions=("agent_approved",),
+        allowed_roles=frozenset({"agent", "supervisor"})
     ),
     
     # Manual Review to Rejected
     StateTransition(
         from_state=WorkflowState.MANUAL_REVIEW,
         to_state=WorkflowState.REJECTED,
-        required_conditions=["agent_rejected"],
-        allowed_roles=["agent", "supervisor"]
+        required_conditions=("agent_rejected",),
+        allowed_roles=frozenset({"agent", "supervisor"})
     ),
     
     # Any state to Expired (system only)
     StateTransition(
         from_state=WorkflowState.SUBMITTED,
         to_state=WorkflowState.EXPIRED,
-        required_conditions=["application_expired"],
-        allowed_roles=["system"]
+        required_conditions=("application_expired",),
+        allowed_roles=frozenset({"system"})
     ),
 ]
 
 
+# Shared empty inner map so missing from-states don't allocate one
+# per lookup
+_EMPTY: Dict = {}
+
+
+def _build_transition_index():
+    index: Dict[WorkflowState, Dict[WorkflowState, StateTransition]] = {}
+    for t in WORKFLOW_TRANSITIONS:
+        index.setdefault(t.from_state, {})[t.to_state] = t
+    return MappingProxyType(
+        {state: MappingProxyType(targets) for state, targets in index.items()}
+    )
+
+
+def _build_role_index():
+    index: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+    for t in WORKFLOW_TRANSITIONS:
+        for role in t.allowed_roles:
+            index[(t.from_state, t.to_state, role)] = t.required_conditions
+    return MappingProxyType(index)
+
+
+def _build_condition_bits():
+    bits: Dict[str, int] = {}
+    for t in WORKFLOW_TRANSITIONS:
+        for name in t.required_conditions:
+            if name not in bits:
+                bits[name] = 1 << len(bits)
+    return MappingProxyType(bits)
+
+
+def _build_role_masks(condition_bits):
+    masks: Dict[Tuple[str, str, str], int] = {}
+    for t in WORKFLOW_TRANSITIONS:
+        mask = 0
+        for name in t.required_conditions:
+            mask |= condition_bits[name]
+        for role in t.allowed_roles:
+            masks[(t.from_state, t.to_state, role)] = mask
+    return MappingProxyType(masks)
+
+
+def _build_next_states():
+    fan_out: Dict[WorkflowState, list] = {}
+    for t in WORKFLOW_TRANSITIONS:
+        fan_out.setdefault(t.from_state, []).append(t.to_state)
+    return MappingProxyType(
+        {state: tuple(targets) for state, targets in fan_out.items()}
+    )
+
+
+# Compiled once at import: the rules are fixed, so the lookup tables
+# are frozen module-level constants (MappingProxyType keeps plain-dict
+# lookup speed while blocking accidental mutation) rather than being
+# rebuilt per WorkflowEngine instance
+TRANSITION_INDEX = _build_transition_index()
+ROLE_INDEX = _build_role_index()
+NEXT_STATES = _build_next_states()
+# Every condition name gets one bit, and each (from, to, role) entry a
+# mask of its required bits: "are all conditions met" collapses to a
+# single AND/compare instead of a loop over names
+CONDITION_BITS = _build_condition_bits()
+ROLE_MASKS = _build_role_masks(CONDITION_BITS)
+
+
+def condition_mask(conditions: Dict[str, bool]) -> int:
+    """Pack a conditions dict into its bitmask (unknown names ignored)"""
+    bits_get = CONDITION_BITS.get
+    mask = 0
+    for name, met in conditions.items():
+        if met:
+            mask |= bits_get(name, 0)
+    return mask
+
+
 class WorkflowEngine:
-    """State machine for KYC workflow"""
-    
-    def __init__(self):
-        self.transitions = {
-            (t.from_state, t.to_state): t for t in WORKFLOW_TRANSITIONS
-        }
+    """State machine for KYC workflow
+
+    Thin facade over the module-level tables; instantiating it costs
+    nothing and every instance shares the same frozen index.
+    """
+
+    # Nested from-state -> to-state -> rule: two single-key hashes
+    # per lookup instead of building and hashing a 2-tuple
+    transitions = TRANSITION_INDEX
+    # (from, to, role) -> required condition names; the allowed case
+    # resolves existence and role in one dict hit
+    _role_index = ROLE_INDEX
+    _next_states = NEXT_STATES
     
     def can_transition(
         self,
@@ -130,29 +221,97 @@ class WorkflowEngine:
         Check if transition is allowed
         Returns: (is_allowed, reason_if_not)
         """
-        transition = self.transitions.get((from_state, to_state))
-        
-        if not transition:
-            return False, f"No transition defined from {from_state} to {to_state}"
-        
-        # Check role
-        if user_role not in transition.allowed_roles:
+        # Fast path: existence + role resolve in one keyed lookup
+        required = self._role_index.get((from_state, to_state, user_role))
+
+        if required is None:
+            # Denied - consult the transition table only to phrase why
+            transition = self.transitions.get(from_state, _EMPTY).get(to_state)
+            if not transition:
+                return False, f"No transition defined from {from_state} to {to_state}"
             return False, f"Role {user_role} not allowed for this transition"
-        
+
         # Check conditions
-        for condition in transition.required_conditions:
+        for condition in required:
             if not conditions.get(condition, False):
                 return False, f"Required condition not met: {condition}"
-        
+
         return True, None
     
-    def get_next_states(self, current_state: str) -> List[str]:
+    def can_transition_bulk(
+        self,
+        rows: List[Tuple[str, str, Dict[str, bool], str]]
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """Check many (from, to, conditions, role) rows in one pass
+
+        For list endpoints that authorize per row: one method dispatch
+        and localized lookups for the whole batch instead of a
+        can_transition call per application.
+        """
+        transitions_get = self.transitions.get
+        out = []
+        append = out.append
+        for from_state, to_state, conditions, user_role in rows:
+            transition = transitions_get(from_state, _EMPTY).get(to_state)
+            if transition is None:
+                append((False, f"No transition defined from {from_state} to {to_state}"))
+            elif user_role not in transition.allowed_roles:
+                append((False, f"Role {user_role} not allowed for this transition"))
+            else:
+                failed = next(
+                    (c for c in transition.required_conditions
+                     if not conditions.get(c, False)),
+                    None
+                )
+                if failed is not None:
+                    append((False, f"Required condition not met: {failed}"))
+                else:
+                    append((True, None))
+        return out
+
+    def get_next_states(self, current_state: str) -> Tuple[str, ...]:
         """Get all possible next states from current state"""
-        return [
-            to_state 
-            for (from_state, to_state) in self.transitions.keys() 
-            if from_state == current_state
-        ]
+        return self._next_states.get(current_state, ())
+
+
+workflow_engine = WorkflowEngine()
+
+
+@lru_cache(maxsize=1024)
+def _cached_can_transition(from_state, to_state, conditions_mask, user_role):
+    required_mask = ROLE_MASKS.get((from_state, to_state, user_role))
+
+    if required_mask is None:
+        transition = TRANSITION_INDEX.get(from_state, _EMPTY).get(to_state)
+        if not transition:
+            return False, f"No transition defined from {from_state} to {to_state}"
+        return False, f"Role {user_role} not allowed for this transition"
+
+    # Branchless check: all required bits present in one AND/compare
+    if conditions_mask & required_mask == required_mask:
+        return True, None
+
+    # Denied - walk the names only to report the first missing one
+    for condition in ROLE_INDEX[(from_state, to_state, user_role)]:
+        if not conditions_mask & CONDITION_BITS[condition]:
+            return False, f"Required condition not met: {condition}"
+    return True, None
+
 
+def can_transition_cached(
+    from_state: str,
+    to_state: str,
+    conditions: Dict[str, bool],
+    user_role: str
+) -> Tuple[bool, Optional[str]]:
+    """Memoized can_transition for the service hot paths
 
-workflow_engine = WorkflowEngine()
\ No newline at end of file
+    The rule walk is pure in its arguments and the condition dicts
+    collapse to a handful of booleans, so the dict packs into an int
+    bitmask: the cache key is a small int instead of a sorted tuple of
+    pairs, and a cache miss decides the whole condition set with one
+    mask compare rather than a per-name loop.
+    """
+    return _cached_can_transition(
+        from_state, to_state, condition_mask(conditions), user_role
+    )
\ No newline at end of file
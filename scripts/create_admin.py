@@ -9,6 +9,7 @@ import getpass
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import select, or_
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.user import User, UserRole, UserStatus
@@ -24,19 +25,22 @@ def create_admin_user():
     db: Session = SessionLocal()
     
     try:
-        print("\n" + "="*50)
-        print("KYC Backend - Create Admin User")
-        print("="*50 + "\n")
+        # One write per banner instead of a flush per line
+        print("\n" + "="*50 + "\nKYC Backend - Create Admin User\n" + "="*50 + "\n")
         
         username = input("Enter admin username: ").strip()
         email = input("Enter admin email: ").strip()
         full_name = input("Enter full name: ").strip()
         
-        # Check if user exists
-        existing_user = db.query(User).filter(
-            (User.username == username) | (User.email == email)
-        ).first()
-        
+        # Check if user exists. Project only User.id and stop at the
+        # first hit: limit(1) lets the planner answer from either
+        # unique index and quit early instead of materializing the row
+        existing_user = db.execute(
+            select(User.id).where(
+                or_(User.username == username, User.email == email)
+            ).limit(1)
+        ).scalar()
+
         if existing_user:
             logger.error("User with this username or email already exists")
             sys.exit(1)
@@ -72,13 +76,15 @@ def create_admin_user():
         db.commit()
         db.refresh(admin)
         
-        print("\n" + "="*50)
-        print("Admin user created successfully!")
-        print("="*50)
-        print(f"Username: {admin.username}")
-        print(f"Email: {admin.email}")
-        print(f"Role: {admin.role}")
-        print("="*50 + "\n")
+        print(
+            "\n" + "="*50 + "\n"
+            "Admin user created successfully!\n"
+            + "="*50 + "\n"
+            f"Username: {admin.username}\n"
+            f"Email: {admin.email}\n"
+            f"Role: {admin.role}\n"
+            + "="*50 + "\n"
+        )
         
     except KeyboardInterrupt:
         print("\n\nOperation cancelled")
@@ -3,26 +3,36 @@
 Generate security keys for the application
 """
 
-import secrets
-from cryptography.fernet import Fernet
+import base64
+import os
 
 print("="*60)
 print("KYC Backend - Security Keys Generator")
 print("="*60)
 print("\nGenerated keys (add to .env file):\n")
 
+# One getrandom(2) syscall covers every key: draw the full entropy
+# buffer up front and slice it, instead of five separate draws
+_buf = os.urandom(32 + 32 + 24 + 24 + 24)
+
+
+def _token(raw: bytes) -> str:
+    """urlsafe token from raw bytes (same shape as secrets.token_urlsafe)"""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
 # Generate SECRET_KEY for JWT
-secret_key = secrets.token_urlsafe(32)
+secret_key = _token(_buf[:32])
 print(f"SECRET_KEY={secret_key}")
 
-# Generate ENCRYPTION_KEY for Fernet
-encryption_key = Fernet.generate_key().decode()
+# Generate ENCRYPTION_KEY for Fernet (32 urlsafe-base64 bytes, padded)
+encryption_key = base64.urlsafe_b64encode(_buf[32:64]).decode()
 print(f"ENCRYPTION_KEY={encryption_key}")
 
 # Generate random passwords
-db_password = secrets.token_urlsafe(24)
-redis_password = secrets.token_urlsafe(24)
-minio_password = secrets.token_urlsafe(24)
+db_password = _token(_buf[64:88])
+redis_password = _token(_buf[88:112])
+minio_password = _token(_buf[112:136])
 
 print(f"\nDB_PASSWORD={db_password}")
 print(f"REDIS_PASSWORD={redis_password}")
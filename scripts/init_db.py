@@ -22,16 +22,30 @@ def init_db():
     """Initialize database"""
     logger.info("Creating database tables...")
     
-    engine = create_engine(settings.DATABASE_URL)
-    
+    # One pooled connection carries every CREATE statement - a single
+    # TCP/TLS handshake for the whole DDL run, and a statement timeout
+    # so a stuck lock fails the script instead of hanging it
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,
+        connect_args={"options": "-c statement_timeout=60000"},
+    )
+
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create all tables in one explicit transaction: every CREATE
+        # ships over the same connection with a single commit, instead
+        # of per-statement autocommit round trips
+        with engine.begin() as conn:
+            Base.metadata.create_all(bind=conn)
         logger.info("Database tables created successfully")
-        
+
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         sys.exit(1)
+    finally:
+        engine.dispose()
 
 
 if __name__ == "__main__":
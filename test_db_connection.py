@@ -1,16 +1,25 @@
 # test_db_connection.py
+from urllib.parse import urlsplit
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
-print("Testing Neon PostgreSQL connection...")
-print(f"Database URL: {settings.DATABASE_URL.split('@')[1]}")  # Hide password
+# Structured parse instead of split('@'): one pass, and a password
+# containing '@' can't leak into the output
+_parts = urlsplit(settings.DATABASE_URL)
+print("Testing Neon PostgreSQL connection...\n"
+      f"Database URL: {_parts.hostname}:{_parts.port}/{_parts.path.lstrip('/')}")
 
+# NullPool: this script connects exactly once, so skip building a
+# connection pool around it
+engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
 try:
-    engine = create_engine(settings.DATABASE_URL)
     with engine.connect() as conn:
         result = conn.execute(text("SELECT version()"))
         version = result.fetchone()[0]
-        print("\nSUCCESS! Connected to PostgreSQL")
-        print(f"Version: {version}")
+        print(f"\nSUCCESS! Connected to PostgreSQL\nVersion: {version}")
 except Exception as e:
-    print(f"\nERROR: {str(e)}")
\ No newline at end of file
+    print(f"\nERROR: {str(e)}")
+finally:
+    engine.dispose()
\ No newline at end of file